@@ -1,7 +1,11 @@
 import random
 
+from vacuum_env import GridEnvironment, NullObserver, RingBufferRecorder
+
 class ReflexVacuumCleaner:
-    def __init__(self):
+    def __init__(self, verbose=False):
+        self.verbose = verbose  # Print every step (formatting output dominates the run time)
+
         # Initialize the environment with two rooms (A and B) and their statuses (clean/dirty)
         self.environment = {
             'A': random.choice(['clean', 'dirty']),
@@ -15,13 +19,15 @@ class ReflexVacuumCleaner:
 
     def clean(self):
         # Clean the current room
-        print(f"Cleaning room {self.current_position}")
+        if self.verbose:
+            print(f"Cleaning room {self.current_position}")
         self.environment[self.current_position] = 'clean'
 
     def move(self):
         # Move to the other room
         next_position = 'A' if self.current_position == 'B' else 'B'
-        print(f"Moving from room {self.current_position} to room {next_position}")
+        if self.verbose:
+            print(f"Moving from room {self.current_position} to room {next_position}")
         self.current_position = next_position
 
     def display_environment(self):
@@ -29,22 +35,98 @@ class ReflexVacuumCleaner:
         print(f"Environment: {self.environment}")
         print(f"Vacuum is in room {self.current_position}")
 
-    def run(self):
-        # Execute the reflex agent's behavior
-        print("Starting the vacuum cleaner...")
+    def run(self, observer=None):
+        # Execute the reflex agent's behavior; the observer (default: vacuum_env.NullObserver)
+        # gets record(step, room, action, dirty) for every step
+        if self.verbose:
+            print("Starting the vacuum cleaner...")
+        record = (NullObserver() if observer is None else observer).record
         steps = 0
         while 'dirty' in self.environment.values():
-            self.display_environment()
+            if self.verbose:
+                self.display_environment()
             status = self.sense_environment()
+            room = self.current_position
             if status == 'dirty':
+                action = "Suck"
                 self.clean()
             else:
+                action = "Right" if room == 'A' else "Left"
                 self.move()
+            record(steps, room, action, status == 'dirty')
             steps += 1
-        print("All rooms are clean!")
-        print(f"Total steps taken: {steps}")
+        if self.verbose:
+            print("All rooms are clean!")
+            print(f"Total steps taken: {steps}")
+        return steps
+
+class GridReflexVacuumCleaner:
+    # Action in the grid for each action of the sweep when rows and columns are swapped
+    TRANSPOSED = {"Up": "Left", "Down": "Right", "Left": "Up", "Right": "Down", "NoOp": "NoOp"}
+
+    def __init__(self, rows, cols):
+        """
+        Reflex agent for a vacuum_env.GridEnvironment: it acts on the current percept
+        ((row, col), dirty) and the direction it is sweeping in. A clean cell is left
+        along a fixed sweep: rows are covered back and forth over columns 1..cols-1 and
+        column 0 is the lane back up to the top, a closed cycle through every cell (the
+        grid is swept column by column when only the number of columns is even). When
+        both sides are odd, or the grid is a single row or column, no such cycle exists:
+        the agent snakes through every cell to the far end and then back along the same
+        snake, turning at both ends.
+        """
+        self.rows = rows
+        self.cols = cols
+        self.transposed = rows % 2 == 1 and cols % 2 == 0
+        self.backward = False  # Going back along the snake (open sweeps only)
+
+    def act(self, percept):
+        (row, col), dirty = percept
+        if dirty:
+            return "Suck"
+        if self.transposed:
+            return self.TRANSPOSED[self.sweep(col, row, self.cols, self.rows)]
+        return self.sweep(row, col, self.rows, self.cols)
+
+    def sweep(self, row, col, rows, cols):
+        # Move out of a clean cell along the sweep of a rows x cols grid
+        last_row = row == rows - 1
+        if rows % 2 == 1 or cols == 1:
+            # Open snake over every column, turning around at either end
+            action = self.snake(row, col, rows, cols)
+            if action == "NoOp":
+                self.backward = not self.backward
+                action = self.snake(row, col, rows, cols)  # Still "NoOp" on a single cell
+            return action
+        if col == 0:
+            return "Up" if row > 0 else "Right"
+        if row % 2 == 0:
+            return "Right" if col < cols - 1 else "Down"
+        if col > 1:
+            return "Left"
+        return "Left" if last_row else "Down"
+
+    def snake(self, row, col, rows, cols):
+        # Next cell along the snake in the current direction, or "NoOp" at its end
+        if self.backward:
+            if row % 2 == 0:
+                return "Left" if col > 0 else ("Up" if row > 0 else "NoOp")
+            return "Right" if col < cols - 1 else "Up"
+        last_row = row == rows - 1
+        if row % 2 == 0:
+            return "Right" if col < cols - 1 else ("NoOp" if last_row else "Down")
+        return "Left" if col > 0 else ("NoOp" if last_row else "Down")
 
 # Run the Reflex Vacuum Cleaner
 if __name__ == "__main__":
-    vacuum = ReflexVacuumCleaner()
+    vacuum = ReflexVacuumCleaner(verbose=True)
     vacuum.run()
+
+    # The same reflex idea on a large grid, without printing every step
+    environment = GridEnvironment(1000, 1000, dirt_probability=0.3, start=(0, 0), seed=0)
+    recorder = RingBufferRecorder(capacity=10000)
+    stats = environment.run(GridReflexVacuumCleaner(1000, 1000), observer=recorder)
+    print(f"\n1000 x 1000 grid: {stats['steps']} steps, "
+          f"{stats['cells_cleaned_per_second']:.0f} cells cleaned per second, "
+          f"{stats['memory_bytes']} bytes of grid")
+    print(f"Actions in the last {len(recorder)} steps: {dict(recorder.action_counts())}")
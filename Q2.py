@@ -1,7 +1,15 @@
 import random
+import time
+from collections import deque
+
+from vacuum_env import CLEAN, DIRTY, MOVES, GridEnvironment, NullObserver
+
+UNKNOWN = 2  # Model value of a cell the agent has not sensed yet
 
 class ModelBasedVacuumCleaner:
-    def __init__(self):
+    def __init__(self, verbose=False):
+        self.verbose = verbose  # Print every step (formatting output dominates the run time)
+
         # Initialize the environment with two rooms (A and B) and their statuses (clean/dirty)
         self.environment = {
             'A': random.choice(['clean', 'dirty']),
@@ -25,14 +33,16 @@ class ModelBasedVacuumCleaner:
 
     def clean(self):
         # Clean the current room
-        print(f"Cleaning room {self.current_position}")
+        if self.verbose:
+            print(f"Cleaning room {self.current_position}")
         self.environment[self.current_position] = 'clean'
         self.model[self.current_position] = 'clean'
 
     def move(self):
         # Move to the other room
         next_position = 'A' if self.current_position == 'B' else 'B'
-        print(f"Moving from room {self.current_position} to room {next_position}")
+        if self.verbose:
+            print(f"Moving from room {self.current_position} to room {next_position}")
         self.current_position = next_position
 
     def display_status(self):
@@ -41,28 +51,138 @@ class ModelBasedVacuumCleaner:
         print(f"Model: {self.model}")
         print(f"Vacuum is in room {self.current_position}")
 
-    def run(self):
-        # Execute the model-based agent's behavior
-        print("Starting the model-based vacuum cleaner...")
+    def run(self, observer=None):
+        # Execute the model-based agent's behavior; the observer (default: vacuum_env.NullObserver)
+        # gets record(step, room, action, dirty) for every step
+        if self.verbose:
+            print("Starting the model-based vacuum cleaner...")
+        record = (NullObserver() if observer is None else observer).record
         steps = 0
         while 'dirty' in self.environment.values():
-            self.display_status()
+            if self.verbose:
+                self.display_status()
             
             # Sense and update the model
             self.update_model()
+            room = self.current_position
+            dirty = self.model[room] == 'dirty'
             
-            if self.model[self.current_position] == 'dirty':
+            if dirty:
+                action = "Suck"
                 self.clean()
             else:
                 # Only move if the other room might still be dirty
                 other_room = 'A' if self.current_position == 'B' else 'B'
+                action = "NoOp"
                 if self.model[other_room] != 'clean':
+                    action = "Right" if room == 'A' else "Left"
                     self.move()
+            record(steps, room, action, dirty)
             steps += 1
-        print("All rooms are clean!")
-        print(f"Total steps taken: {steps}")
+        if self.verbose:
+            print("All rooms are clean!")
+            print(f"Total steps taken: {steps}")
+        return steps
+
+class GridModelBasedVacuumCleaner:
+    def __init__(self, rows, cols):
+        """
+        Model-based agent for a vacuum_env.GridEnvironment. Its model is one byte per
+        cell (UNKNOWN, CLEAN or DIRTY) and the frontier is the set of unknown cells next
+        to sensed ones, updated as each cell is sensed. A clean cell is left towards the
+        nearest frontier cell: a BFS over the sensed cells plans the path once and the
+        path is followed until its target has been sensed. When every cell is known the
+        model is forgotten and exploration starts over, so regenerated dirt is found.
+        """
+        self.rows = rows
+        self.cols = cols
+        self.model = bytearray([UNKNOWN]) * (rows * cols)
+        self.unknown = rows * cols
+        self.frontier = set()
+        self.path = []  # Cells still to visit, next one last
+        self.target = None
+        self.plans = 0
+        self.planning_seconds = 0.0
+
+        # Action that leads to a neighbouring cell, by (row, col) offset
+        self.actions = {offset: action for action, offset in MOVES.items()}
+
+    def neighbors(self, cell):
+        row, col = divmod(cell, self.cols)
+        if row > 0:
+            yield cell - self.cols
+        if row < self.rows - 1:
+            yield cell + self.cols
+        if col > 0:
+            yield cell - 1
+        if col < self.cols - 1:
+            yield cell + 1
+
+    def update_model(self, cell, dirty):
+        # Record the sensed status and move the frontier past this cell
+        if self.model[cell] == UNKNOWN:
+            self.unknown -= 1
+            self.frontier.discard(cell)
+            for neighbor in self.neighbors(cell):
+                if self.model[neighbor] == UNKNOWN:
+                    self.frontier.add(neighbor)
+        self.model[cell] = DIRTY if dirty else CLEAN
+
+    def plan(self, start):
+        """
+        Breadth-first search from `start` through sensed cells to the nearest frontier
+        cell. Sets the cached path and target; returns False if there is no frontier.
+        """
+        started = time.perf_counter()
+        self.plans += 1
+        parents = {start: None}
+        queue = deque([start])
+        self.path, self.target = [], None
+        while queue:
+            cell = queue.popleft()
+            if cell in self.frontier:
+                self.target = cell
+                while cell != start:
+                    self.path.append(cell)
+                    cell = parents[cell]
+                break
+            for neighbor in self.neighbors(cell):
+                if neighbor not in parents:
+                    parents[neighbor] = cell
+                    queue.append(neighbor)
+        self.planning_seconds += time.perf_counter() - started
+        return self.target is not None
+
+    def act(self, percept):
+        (row, col), dirty = percept
+        cell = row * self.cols + col
+        self.update_model(cell, dirty)
+        if dirty:
+            self.model[cell] = CLEAN
+            return "Suck"
+
+        if self.target is None or self.model[self.target] != UNKNOWN or not self.path:
+            if not self.frontier:
+                if self.unknown:
+                    return "NoOp"
+                # Everything has been sensed: forget the model and explore again
+                self.model = bytearray([UNKNOWN]) * (self.rows * self.cols)
+                self.unknown = self.rows * self.cols
+                self.update_model(cell, dirty)
+            if not self.plan(cell):
+                return "NoOp"
+        next_row, next_col = divmod(self.path.pop(), self.cols)
+        return self.actions[next_row - row, next_col - col]
 
 # Run the Model-Based Vacuum Cleaner
 if __name__ == "__main__":
-    vacuum = ModelBasedVacuumCleaner()
+    vacuum = ModelBasedVacuumCleaner(verbose=True)
     vacuum.run()
+
+    # The model-based idea on larger grids: steps and planning time per step
+    for size in (100, 300):
+        environment = GridEnvironment(size, size, dirt_probability=0.3, seed=0)
+        agent = GridModelBasedVacuumCleaner(size, size)
+        stats = environment.run(agent)
+        print(f"\n{size} x {size} grid: {stats['steps']} steps, {agent.plans} plans, "
+              f"{agent.planning_seconds / stats['steps'] * 1e6:.2f} us planning per step")
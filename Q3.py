@@ -1,13 +1,42 @@
+import struct
+import sys
+from array import array
 from collections import deque
+from itertools import product
+
+from search import Problem, graph_search
 
 class WaterJug:
-    def __init__(self, initial_state, goal_state):
-        self.initial_state = initial_state  # Initial state (4-litre jug, 3-litre jug)
-        self.goal_state = goal_state       # Goal state (4-litre jug, 3-litre jug)
+    def __init__(self, initial_state, goal_state, capacities=(4, 3)):
+        """
+        Initialize the water jug problem.
+        - initial_state: Tuple of litres in each jug.
+        - goal_state: Tuple of litres in each jug, where None matches any amount,
+          or a predicate called with a state and returning True at the goal.
+        - capacities: Capacity of each jug (default: a 4-litre and a 3-litre jug).
+        """
+        self.initial_state = initial_state  # Initial state (litres in each jug)
+        self.goal_state = goal_state       # Goal state (litres in each jug, None wildcards) or predicate
+        self.capacities = tuple(capacities)
+        self.states_visited = 0  # States stored by the last search
 
     def goalTest(self, current_state):
         """Check if the current state matches the goal state."""
-        return current_state == self.goal_state
+        if callable(self.goal_state):
+            return self.goal_state(current_state)
+        return all(goal is None or goal == amount for goal, amount in zip(self.goal_state, current_state))
+
+    def goal_states(self):
+        """
+        Enumerate every state matching the goal, expanding None to each possible amount.
+        Raises ValueError for predicate goals, which cannot be enumerated.
+        """
+        if callable(self.goal_state):
+            raise ValueError("A goal predicate cannot be enumerated; give a goal tuple instead")
+        choices = [range(capacity + 1) if goal is None else [goal]
+                   for goal, capacity in zip(self.goal_state, self.capacities)]
+        return [state for state in product(*choices)
+                if all(0 <= amount <= capacity for amount, capacity in zip(state, self.capacities))]
 
     def successor(self, state):
         """
@@ -15,74 +44,373 @@ class WaterJug:
         using the water jug problem rules.
         """
         successors = []
-        jug1, jug2 = state  # jug1 = 4L jug, jug2 = 3L jug
-
-        # Rule 1: Fill the 4-litre jug
-        if jug1 < 4:
-            successors.append((4, jug2))
-        # Rule 2: Fill the 3-litre jug
-        if jug2 < 3:
-            successors.append((jug1, 3))
-        # Rule 3: Empty the 4-litre jug
-        if jug1 > 0:
-            successors.append((0, jug2))
-        # Rule 4: Empty the 3-litre jug
-        if jug2 > 0:
-            successors.append((jug1, 0))
-        # Rule 5: Pour water from 4-litre to 3-litre jug until the latter is full or the former is empty
-        transfer = min(jug1, 3 - jug2)
-        if transfer > 0:
-            successors.append((jug1 - transfer, jug2 + transfer))
-        # Rule 6: Pour water from 3-litre to 4-litre jug until the latter is full or the former is empty
-        transfer = min(jug2, 4 - jug1)
-        if transfer > 0:
-            successors.append((jug1 + transfer, jug2 - transfer))
+        capacities = self.capacities
+        jugs = range(len(state))
+
+        # Rule 1: Fill a jug
+        for i in jugs:
+            if state[i] < capacities[i]:
+                successors.append(state[:i] + (capacities[i],) + state[i + 1:])
+        # Rule 2: Empty a jug
+        for i in jugs:
+            if state[i] > 0:
+                successors.append(state[:i] + (0,) + state[i + 1:])
+        # Rule 3: Pour jug i into jug j until the latter is full or the former is empty
+        for i in jugs:
+            for j in jugs:
+                if i != j:
+                    transfer = min(state[i], capacities[j] - state[j])
+                    if transfer > 0:
+                        new_state = list(state)
+                        new_state[i] -= transfer
+                        new_state[j] += transfer
+                        successors.append(tuple(new_state))
 
         return successors
 
-    def generate_path(self, closed, state):
-        """Trace the path from the initial state to the goal state."""
+    def predecessor_moves(self, state, reachable_only=False):
+        """
+        The moves that reach `state`, as (i, j, amounts): jug i held one of `amounts`
+        before the move, and j is the jug poured into or out of (None for a fill or
+        an empty), which held whatever jug i gained or lost. The amounts are ranges
+        or short lists, so they can be counted without building the predecessors.
+        With reachable_only=True, amounts that no move sequence from the initial
+        state can produce are left out (see is_reachable_shape).
+        """
+        moves = []
+        capacities = self.capacities
+        initial = self.initial_state
+        jugs = range(len(state))
+        at_limit = [amount == 0 or amount == capacity for amount, capacity in zip(state, capacities)]
+        limit_count = sum(at_limit)
+
+        def candidates(low, high, limits, jug, others_at_limit):
+            # Amounts for `jug` in [low, high]; if the other jugs cannot make the
+            # predecessor reachable, only amounts putting `jug` at a limit (or matching
+            # the initial state) can
+            if not reachable_only or others_at_limit:
+                return range(low, high + 1)
+            return [amount for amount in set(limits + [initial[jug]]) if low <= amount <= high]
+
+        for i in jugs:
+            others_at_limit = limit_count > at_limit[i]
+            # A full jug may have just been filled from any lower amount
+            if state[i] == capacities[i]:
+                moves.append((i, None, candidates(0, capacities[i] - 1, [0], i, others_at_limit)))
+            # An empty jug may have just been emptied from any amount
+            if state[i] == 0:
+                moves.append((i, None, candidates(1, capacities[i], [capacities[i]], i, others_at_limit)))
+
+        for i in jugs:
+            for j in jugs:
+                if i == j:
+                    continue
+                others_at_limit = limit_count > at_limit[i] + at_limit[j]
+                if state[i] == 0:
+                    # Jug i was poured out completely into jug j (jug i held `amount`)
+                    limits = [capacities[i], state[j], state[j] - capacities[j]]
+                    amounts = candidates(1, min(state[j], capacities[i]), limits, i, others_at_limit)
+                    moves.append((i, j, amounts))
+                elif state[j] == capacities[j]:
+                    # Jug i filled jug j and kept the rest (jug i held `amount`)
+                    limits = [capacities[i], state[i] + capacities[j]]
+                    high = min(state[i] + capacities[j], capacities[i])
+                    moves.append((i, j, candidates(state[i] + 1, high, limits, i, others_at_limit)))
+
+        return moves
+
+    def predecessors(self, state, reachable_only=False):
+        """
+        Generate the states that reach `state` in one move (the inverse of successor).
+        Used by the backward half of bidirectional search.
+        With reachable_only=True, only predecessors of reachable shape are generated.
+        """
+        predecessors = []
+        for i, j, amounts in self.predecessor_moves(state, reachable_only):
+            for amount in amounts:
+                new_state = list(state)
+                if j is not None:
+                    new_state[j] -= amount - state[i]  # Jug j gave or took what jug i lost or gained
+                new_state[i] = amount
+                new_state = tuple(new_state)
+                if not reachable_only or self.is_reachable_shape(new_state):
+                    predecessors.append(new_state)
+        return predecessors
+
+    def predecessor_count(self, state):
+        """
+        Upper bound on len(backward_neighbors(state)), computed without generating them.
+        """
+        return sum(len(amounts) for _, _, amounts in self.predecessor_moves(state, reachable_only=True))
+
+    def is_reachable_shape(self, state):
+        """
+        Every move leaves some jug empty or full, so a state with no jug at either
+        limit can only be reached if it is the initial state itself.
+        """
+        return state == self.initial_state or any(
+            amount == 0 or amount == capacity for amount, capacity in zip(state, self.capacities))
+
+    def search(self, method="BFS"):
+        """
+        Perform search to find the solution.
+        Supports DFS, BFS and Bidirectional (BFS from both ends, see bidirectional_search),
+        plus the other methods of search.graph_search (UCS, A*, Greedy, IDA*) without
+        a heuristic. A state is closed when it is generated, so duplicates never reach
+        the open list.
+        """
+        if method == "Bidirectional":
+            return self.bidirectional_search()
+
+        problem = Problem(self.initial_state, self.successor, self.goalTest)
+        closed = {}  # Store visited states with (state, parent)
+        path = graph_search(problem, method, closed=closed)
+        self.states_visited = len(closed)
+        return path
+
+    def reachable_goal_states(self):
+        """
+        The goal states of reachable shape (see is_reachable_shape), built jug by jug
+        from the states with that jug at a limit rather than filtered out of every
+        goal state. Raises ValueError for predicate goals, which cannot be enumerated.
+        """
+        if callable(self.goal_state):
+            raise ValueError("A goal predicate cannot be enumerated; give a goal tuple instead")
+        choices = [range(capacity + 1) if goal is None else ([goal] if 0 <= goal <= capacity else [])
+                   for goal, capacity in zip(self.goal_state, self.capacities)]
+        goals = set()
+        for k, capacity in enumerate(self.capacities):
+            limits = [amount for amount in {0, capacity} if amount in choices[k]]
+            goals.update(product(*choices[:k], limits, *choices[k + 1:]))
+        return sorted(goals)
+
+    def bidirectional_search(self):
+        """
+        Breadth-first search from the initial state and, backwards through
+        predecessors, from every goal state at once, one whole layer at a time.
+        The first layer in which the two searches meet gives a shortest path.
+        A full or empty jug can have any number of predecessors, so the backward
+        side often fans out far more than the forward one. Before each layer both
+        costs are estimated (forward from the branching seen so far, backward exactly
+        by predecessor_count, counting only as far as the comparison needs) and only
+        the cheaper side is expanded. When the backward side is never the cheaper one
+        this is plain BFS with a goal test, and the goal states are not stored at all.
+        A goal predicate cannot be searched backwards, so it gets forward BFS instead.
+        """
+        if callable(self.goal_state):
+            return self.search("BFS")
+
+        goal_test = self.goalTest
+        # Each side maps a state to its neighbour toward its own root
+        forward = {self.initial_state: None}
+        backward = {}
+        forward_layer = [self.initial_state]
+        backward_layer = self.reachable_goal_states()
+        backward_counts = map(self.predecessor_count, backward_layer)
+        backward_cost = 0  # Predecessors counted so far in the backward layer
+        jugs = len(self.capacities)
+        branching = jugs * (jugs + 1)  # Successors per state: at most n fills, n empties and n(n - 1) pours
+
+        def meets_backward(state):
+            return state in backward or goal_test(state)
+
+        def meets_forward(state):
+            return state in forward
+
+        meeting = self.initial_state if goal_test(self.initial_state) else None
+        while meeting is None and forward_layer and backward_layer:
+            forward_cost = len(forward_layer) * branching
+            for count in backward_counts:
+                backward_cost += count
+                if backward_cost > forward_cost:
+                    break
+            if forward_cost < backward_cost:
+                layer = forward_layer
+                forward_layer, meeting, work = self.expand_layer(layer, forward, meets_backward, self.successor)
+                branching = work / len(layer)
+            else:
+                if not backward:  # First backward layer: store the goal states
+                    backward = dict.fromkeys(backward_layer)
+                backward_layer, meeting, _ = self.expand_layer(backward_layer, backward, meets_forward,
+                                                               self.backward_neighbors)
+                backward_counts = map(self.predecessor_count, backward_layer)
+                backward_cost = 0
+
+        self.states_visited = len(forward) + len(backward)
+        if meeting is None:
+            return None  # If no solution is found
+
+        # Join the forward path (initial -> meeting) and the backward path (meeting -> goal)
         path = []
+        state = meeting
         while state is not None:
             path.append(state)
-            state = closed[state]  # Backtrack using the parent information
-        return path[::-1]  # Reverse the path
+            state = forward[state]
+        path.reverse()
+        state = backward.get(meeting)
+        while state is not None:
+            path.append(state)
+            state = backward[state]
+        return path
 
-    def search(self, method="BFS"):
+    def backward_neighbors(self, state):
+        """Predecessors that can lie on a path from the initial state."""
+        return self.predecessors(state, reachable_only=True)
+
+    def expand_layer(self, layer, visited, is_meeting, expand):
         """
-        Perform search to find the solution.
-        Supports DFS and BFS.
+        Expand one BFS layer of a bidirectional search.
+        Returns the next layer, the first state for which is_meeting is True
+        (or None) and the number of states generated.
+        """
+        next_layer = []
+        work = 0
+        for state in layer:
+            neighbors = expand(state)
+            work += len(neighbors)
+            for neighbor in neighbors:
+                if neighbor in visited:
+                    continue
+                visited[neighbor] = state
+                if is_meeting(neighbor):
+                    return next_layer, neighbor, work
+                next_layer.append(neighbor)
+        return next_layer, None, work
+
+
+class ReachabilityTable:
+    def __init__(self, capacities=(4, 3)):
+        """
+        Shortest-path table for one jug configuration.
+        States are numbered in mixed radix (jug i contributes a digit in 0..capacity_i),
+        and for every source the BFS parent of each state is kept in a compact int array.
+        """
+        self.capacities = tuple(capacities)
+        self.count = 1
+        for capacity in self.capacities:
+            self.count *= capacity + 1
+        self.parents = {}  # source index -> array of parent indices (-1: unreachable)
+
+    def index(self, state):
+        """Number a state in mixed radix."""
+        index = 0
+        for amount, capacity in zip(state, self.capacities):
+            index = index * (capacity + 1) + amount
+        return index
+
+    def state(self, index):
+        """Inverse of index."""
+        amounts = []
+        for capacity in reversed(self.capacities):
+            index, amount = divmod(index, capacity + 1)
+            amounts.append(amount)
+        return tuple(reversed(amounts))
+
+    def build(self, sources=None):
+        """
+        Build the state graph once (as offset/target arrays) and run one BFS per source.
+        By default every state is a source, so any pair can be queried.
         """
-        open_list = deque()  # Queue for BFS, Stack for DFS
-        closed = {}  # Store visited states with parent
-        open_list.append((self.initial_state, None))  # (state, parent)
+        problem = WaterJug(None, None, self.capacities)
 
-        while open_list:
-            if method == "BFS":
-                current_state, parent = open_list.popleft()
-            elif method == "DFS":
-                current_state, parent = open_list.pop()
+        # Successors of state k are targets[offsets[k]:offsets[k + 1]]
+        offsets = array("i", [0])
+        targets = array("i")
+        for index in range(self.count):
+            targets.extend(self.index(successor) for successor in problem.successor(self.state(index)))
+            offsets.append(len(targets))
 
-            # If the goal is found, return the solution path
-            if self.goalTest(current_state):
-                closed[current_state] = parent
-                return self.generate_path(closed, current_state)
+        if sources is None:
+            sources = range(self.count)
+        for source in sources:
+            if not isinstance(source, int):
+                source = self.index(source)
+            parent = array("i", [-1]) * self.count
+            parent[source] = source
+            queue = deque([source])
+            while queue:
+                current = queue.popleft()
+                for k in range(offsets[current], offsets[current + 1]):
+                    target = targets[k]
+                    if parent[target] == -1:
+                        parent[target] = current
+                        queue.append(target)
+            self.parents[source] = parent
+        return self
 
-            # Add the current state to the closed list
-            if current_state not in closed:
-                closed[current_state] = parent
-                # Add all unvisited successors to the open list
-                for successor in self.successor(current_state):
-                    if successor not in closed:
-                        open_list.append((successor, current_state))
+    def query(self, source_state, target_state):
+        """
+        Shortest path from source_state to target_state by table lookup,
+        or None if the target is unreachable.
+        """
+        source = self.index(source_state)
+        parent = self.parents.get(source)
+        if parent is None:
+            raise KeyError(f"{source_state} is not a source of this table")
+        current = self.index(target_state)
+        if parent[current] == -1:
+            return None
+        path = [current]
+        while current != source:
+            current = parent[current]
+            path.append(current)
+        return [self.state(index) for index in reversed(path)]
 
-        return None  # If no solution is found
+    def solve(self, problem):
+        """
+        Answer a WaterJug problem from the table: the shortest path to any goal state.
+        """
+        if callable(problem.goal_state):
+            goals = [self.state(index) for index in range(self.count) if problem.goalTest(self.state(index))]
+        else:
+            goals = problem.goal_states()
+        best = None
+        for goal in goals:
+            path = self.query(problem.initial_state, goal)
+            if path is not None and (best is None or len(path) < len(best)):
+                best = path
+        return best
+
+    def save(self, path):
+        """
+        Persist the table: magic, jug count, capacities, source count, then for each
+        source its index followed by its parent array (all little-endian int32).
+        """
+        header = struct.pack(f"<4sI{len(self.capacities)}II", b"WJT1", len(self.capacities),
+                             *self.capacities, len(self.parents))
+        with open(path, "wb") as handle:
+            handle.write(header)
+            for source, parent in self.parents.items():
+                handle.write(struct.pack("<i", source))
+                if sys.byteorder == "big":
+                    parent = array("i", parent)
+                    parent.byteswap()
+                handle.write(parent.tobytes())
+
+    @classmethod
+    def load(cls, path):
+        """Reload a table written by save instead of rebuilding it."""
+        with open(path, "rb") as handle:
+            magic, jugs = struct.unpack("<4sI", handle.read(8))
+            if magic != b"WJT1":
+                raise ValueError(f"{path} is not a water jug table")
+            capacities = struct.unpack(f"<{jugs}I", handle.read(4 * jugs))
+            (sources,) = struct.unpack("<I", handle.read(4))
+            table = cls(capacities)
+            for _ in range(sources):
+                (source,) = struct.unpack("<i", handle.read(4))
+                parent = array("i")
+                parent.frombytes(handle.read(4 * table.count))
+                if sys.byteorder == "big":
+                    parent.byteswap()
+                table.parents[source] = parent
+        return table
 
 
 # Driver Code
 if __name__ == "__main__":
     # Initial state: (4L jug, 3L jug) -> (4, 0)
-    # Goal state: (4L jug, 3L jug) -> (2, x) where x is any value
+    # Goal state: (4L jug, 3L jug) -> (2, 0)
     initial_state = (4, 0)
     goal_state = (2, 0)  # We aim to have exactly 2L in the 4L jug
 
@@ -103,3 +431,20 @@ if __name__ == "__main__":
         print("Solution Path:", solution)
     else:
         print("No solution found.")
+
+    # Goal (2, None): 2L in the 4L jug and any amount in the 3L jug
+    print("\nSolving (2, x) using Bidirectional search:")
+    solution = WaterJug(initial_state, (2, None)).search(method="Bidirectional")
+    if solution:
+        print("Solution Path:", solution)
+    else:
+        print("No solution found.")
+
+    # Build the all-pairs table once and answer the same query by lookup
+    print("\nSolving using the reachability table:")
+    table = ReachabilityTable(water_jug_problem.capacities).build()
+    solution = table.solve(water_jug_problem)
+    if solution:
+        print("Solution Path:", solution)
+    else:
+        print("No solution found.")
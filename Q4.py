@@ -1,51 +1,89 @@
-from collections import deque
+from external_bfs import external_bfs
+from Q5 import SupportHeuristic
+from search import Problem, graph_search
 
 class BlockWorld:
-    def __init__(self, initial_state, goal_state):
+    def __init__(self, initial_state, goal_state, canonical=False):
         """
         Initialize the BlockWorld problem with an initial and goal state.
         Each state is represented as a list of stacks.
+        With canonical=True the stacks are interchangeable table positions: states
+        equal up to reordering the stacks are searched (and matched to the goal) once.
         """
         self.initial_state = initial_state
         self.goal_state = goal_state
+        self.canonical = canonical
+        self.goal_key = self.key(self.state_to_tuple(goal_state))
+
+        # Q5's support heuristic, compiled once for stacks listed with the top block last
+        self.support = SupportHeuristic(goal_state, top_first=False)
+        self.goal_score = self.support(goal_state)
 
     def goalTest(self, current_state):
         """
-        Check if the current state matches the goal state.
+        Check if the current state (list of lists) matches the goal state.
         """
-        return current_state == self.goal_state
+        return self.key(self.state_to_tuple(current_state)) == self.goal_key
 
     def successor(self, state):
         """
-        Generate possible successors from the current state by moving one block
-        from the top of a stack to another stack.
+        Generate possible successors from the current state (list of lists) by moving
+        one block from the top of a stack to another stack (see successor_moves).
+        """
+        successors = self.successor_tuples(self.state_to_tuple(state))
+        return [[list(stack) for stack in successor] for successor in successors]
+
+    def successor_tuples(self, state):
+        """
+        Generate successors of a tuple-of-tuples state (see successor_moves).
+        """
+        return [successor for _, _, successor in self.successor_moves(state)]
+
+    def successor_moves(self, state):
+        """
+        Generate (source stack, destination stack, successor) for every move from a
+        tuple-of-tuples state without copying it: each successor is a new outer
+        tuple that shares every stack the move leaves untouched. With canonical=True
+        only the first empty stack is used as a destination, since the other empty
+        stacks give the same state up to reordering the stacks.
         """
         successors = []
-        num_stacks = len(state)
+        empty_destination = None
+        if self.canonical:
+            empty_destination = next((j for j, stack in enumerate(state) if not stack), None)
 
-        for i in range(num_stacks):  # Iterate through all stacks
-            if not state[i]:  # Skip empty stacks
+        for i, source in enumerate(state):
+            if not source:  # Skip empty stacks
                 continue
-            for j in range(num_stacks):  # Try to move the block to all other stacks
-                if i != j:
-                    # Create a deep copy of the state
-                    new_state = [stack[:] for stack in state]
-                    # Move the top block from stack i to stack j
-                    block = new_state[i].pop()
-                    new_state[j].append(block)
-                    successors.append(new_state)
+            block = source[-1]
+            remaining = source[:-1]
+            for j, destination in enumerate(state):
+                if i == j or (not destination and empty_destination is not None and j != empty_destination):
+                    continue
+                new_state = list(state)
+                new_state[i] = remaining
+                new_state[j] = destination + (block,)
+                successors.append((i, j, tuple(new_state)))
 
         return successors
 
-    def generate_path(self, closed, state):
+    def key(self, state):
         """
-        Trace the path from the initial state to the goal state.
+        Closed-list key of a tuple-of-tuples state. With canonical=True this is the
+        state with its stacks sorted and empty stacks last.
         """
-        path = []
-        while state is not None:
-            path.append(state)
-            state = closed[state]  # Backtrack using the parent information
-        return path[::-1]  # Reverse the path
+        if not self.canonical:
+            return state
+        nonempty = sorted(stack for stack in state if stack)
+        return tuple(nonempty) + ((),) * (len(state) - len(nonempty))
+
+    def support_heuristic(self, state):
+        """
+        Q5's support-structure score turned into a cost estimate: the goal's score
+        minus the state's score. It is 0 at the goal but not admissible, so A*
+        with it is not guaranteed to return a shortest path.
+        """
+        return self.goal_score - self.support(state)
 
     def state_to_tuple(self, state):
         """
@@ -53,37 +91,74 @@ class BlockWorld:
         """
         return tuple(tuple(stack) for stack in state)
 
-    def search(self, method="BFS"):
+    def enumerate_layers(self, directory=None, chunk_records=1 << 18, fan_in=64):
+        """
+        Enumerate every state reachable from the initial state with a disk-backed
+        breadth-first search (see external_bfs.external_bfs), so memory stays bounded
+        by chunk_records and fan_in. A state is stored as its closed-list key in a fixed-size
+        record: each stack's block numbers followed by a 0 byte. Returns the layer
+        sizes, state count and diameter.
+        """
+        blocks = sorted(block for stack in self.initial_state for block in stack)
+        codes = {block: code for code, block in enumerate(blocks, 1)}
+        record_size = len(blocks) + len(self.initial_state)
+
+        def encode(state):
+            return b"".join(bytes(codes[block] for block in stack) + b"\0" for stack in self.key(state))
+
+        def decode(record):
+            return tuple(tuple(blocks[code - 1] for code in stack) for stack in record.split(b"\0")[:-1])
+
+        def successors(record):
+            return [encode(successor) for successor in self.successor_tuples(decode(record))]
+
+        start = encode(self.state_to_tuple(self.initial_state))
+        return external_bfs([start], successors, record_size, directory=directory, chunk_records=chunk_records,
+                            fan_in=fan_in)
+
+    def problem(self, heuristic=None):
         """
-        Perform search to find the solution. Supports DFS and BFS.
+        This puzzle as a search.Problem over tuple-of-tuples states. The heuristic
+        defaults to support_heuristic, which is then updated per move from the one
+        block that moves instead of rescoring every stack.
         """
-        open_list = deque()  # Queue for BFS, Stack for DFS
-        closed = {}  # Store visited states with parent
+        goal_key = self.goal_key
+
+        def is_goal(state):
+            return self.key(state) == goal_key
+
+        if heuristic is not None:
+            return Problem(self.state_to_tuple(self.initial_state), self.successor_tuples, is_goal,
+                           key=self.key, heuristic=heuristic)
 
-        # Convert initial state to tuple for hashing and add to open list
-        open_list.append((self.state_to_tuple(self.initial_state), None))
+        move_delta = self.support.move_delta
 
-        while open_list:
-            if method == "BFS":
-                current_state, parent = open_list.popleft()
-            elif method == "DFS":
-                current_state, parent = open_list.pop()
+        def expand(state, h_cost):
+            return [(successor, 1, h_cost - move_delta(state, source, destination))
+                    for source, destination, successor in self.successor_moves(state)]
 
-            # If the goal is found, return the solution path
-            if self.goalTest(list(map(list, current_state))):
-                closed[current_state] = parent
-                return self.generate_path(closed, current_state)
+        return Problem(self.state_to_tuple(self.initial_state), self.successor_tuples, is_goal,
+                       key=self.key, heuristic=self.support_heuristic, expand=expand)
 
-            # Add the current state to the closed list
-            if current_state not in closed:
-                closed[current_state] = parent
-                # Generate successors and add unvisited ones to the open list
-                for successor in self.successor(list(map(list, current_state))):
-                    successor_tuple = self.state_to_tuple(successor)
-                    if successor_tuple not in closed:
-                        open_list.append((successor_tuple, current_state))
+    def search(self, method="BFS", **informed_options):
+        """
+        Perform search to find the solution. Supports DFS and BFS, and the
+        informed methods of informed_search (A*, Weighted A*, Greedy, UCS).
+        States stay tuples of tuples throughout and each is keyed once. BFS and DFS
+        add a state to the closed list when it is generated, so duplicates never
+        reach the open list.
+        """
+        if method in ("A*", "Weighted A*", "Greedy", "UCS"):
+            return self.informed_search(method, **informed_options)
+        return graph_search(self.problem(), method)
 
-        return None  # If no solution is found
+    def informed_search(self, method="A*", heuristic=None, weight=2.0):
+        """
+        Perform best-first search ordered by f = g + h (A*), f = g + weight * h
+        (Weighted A*), f = h (Greedy) or f = g (UCS). The heuristic takes a
+        tuple-of-tuples state and defaults to support_heuristic (see problem).
+        """
+        return graph_search(self.problem(heuristic), method, weight=weight)
 
 
 # Driver Code
@@ -123,3 +198,12 @@ if __name__ == "__main__":
             print(step)
     else:
         print("No solution found.")
+
+    print("\nSolving using A* with the Q5 heuristic:")
+    solution = block_world_problem.search(method="A*")
+    if solution:
+        print("Solution Path:")
+        for step in solution:
+            print(step)
+    else:
+        print("No solution found.")
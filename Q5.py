@@ -1,3 +1,110 @@
+class SupportHeuristic:
+    def __init__(self, goal_state, top_first=True):
+        """
+        Compile the goal of a Blocks World Problem once for repeated heuristic evaluation.
+
+        Parameters:
+        - goal_state: Goal state of the blocks, represented as a list of stacks.
+        - top_first: True if stacks list the top block first (as calculate_heuristic
+          does), False if the top block is last (as Q4.BlockWorld does). Applies to
+          goal_state and to every state evaluated.
+
+        Seen from the bottom of a stack, a block at height h (0 on the table) adds
+        h + 1 to the score if it sits on its correct support and subtracts h + 1
+        otherwise. Moving one top block therefore only changes that block's term.
+        """
+        self.top_first = top_first
+
+        # Create a dictionary mapping each block to its correct support in the goal state
+        self.correct_support = {}
+        for stack in goal_state:
+            stack = self.bottom_up(stack)
+            if stack:
+                self.correct_support[stack[0]] = None  # The bottom block has no support
+            for i in range(1, len(stack)):
+                self.correct_support[stack[i]] = stack[i - 1]
+
+    def bottom_up(self, stack):
+        """
+        Return the blocks of a stack from the bottom up.
+        """
+        return stack[::-1] if self.top_first else stack
+
+    def block_value(self, block, support, height):
+        """
+        Contribution of `block` resting on `support` (None for the table) at `height`.
+        """
+        if self.correct_support.get(block) == support:
+            return height + 1  # Correct support structure
+        return -(height + 1)  # Incorrect support structure
+
+    def stack_value(self, stack):
+        """
+        Heuristic contribution of a single stack.
+        """
+        stack = self.bottom_up(stack)
+        value = 0
+        support = None
+        for height, block in enumerate(stack):
+            value += self.block_value(block, support, height)
+            support = block
+        return value
+
+    def __call__(self, state):
+        """
+        Heuristic value of a whole state (same result as calculate_heuristic).
+        """
+        return sum(self.stack_value(stack) for stack in state)
+
+    def top(self, stack):
+        """
+        Return (top block, block under it or None, height of the top block).
+        """
+        if self.top_first:
+            return stack[0], (stack[1] if len(stack) > 1 else None), len(stack) - 1
+        return stack[-1], (stack[-2] if len(stack) > 1 else None), len(stack) - 1
+
+    def move_delta(self, state, source, destination):
+        """
+        Change in heuristic value when the top block of state[source] is moved onto
+        state[destination]. Only the moved block's term changes, so this is O(1).
+        """
+        block, support, height = self.top(state[source])
+        target = state[destination]
+        if target:
+            new_support = target[0] if self.top_first else target[-1]
+        else:
+            new_support = None
+        return self.block_value(block, new_support, len(target)) - self.block_value(block, support, height)
+
+    def evaluate_moves(self, state, value=None):
+        """
+        Score every successor of a state at once.
+
+        Returns a list of (source, destination, heuristic value) for each move of a
+        top block onto another stack. The value of `state` is computed if not given.
+        """
+        if value is None:
+            value = self(state)
+        scored = []
+        # Terms of each stack's top block as it stands, and the surface it offers
+        removed = {}
+        surfaces = []
+        for i, stack in enumerate(state):
+            if stack:
+                block, support, height = self.top(stack)
+                removed[i] = (block, value - self.block_value(block, support, height))
+                surfaces.append(block)
+            else:
+                surfaces.append(None)
+        for source, (block, base) in removed.items():
+            for destination, stack in enumerate(state):
+                if destination != source:
+                    scored.append((source, destination,
+                                   base + self.block_value(block, surfaces[destination], len(stack))))
+        return scored
+
+
 def calculate_heuristic(state, goal_state):
     """
     Calculate the heuristic value of the given state for the Blocks World Problem.
@@ -8,41 +115,10 @@ def calculate_heuristic(state, goal_state):
     
     Returns:
     - heuristic_value: An integer representing the heuristic value of the state.
-    """
-    heuristic_value = 0
-
-    # Create a dictionary mapping each block to its correct support in the goal state
-    correct_support = {}
-    for stack in goal_state:
-        for i in range(len(stack) - 1):
-            correct_support[stack[i]] = stack[i + 1]
-        if stack:
-            correct_support[stack[-1]] = None  # The last block in a stack has no support
-
-    # Evaluate the heuristic for the current state
-    for stack in state:
-        for i in range(len(stack) - 1):
-            current_block = stack[i]
-            support_block = stack[i + 1]
-            # Check if the current block has the correct support
-            if correct_support.get(current_block) == support_block:
-                # Correct support structure: +1 for every block in the structure
-                heuristic_value += (len(stack) - i)
-            else:
-                # Incorrect support structure: -1 for every block in the structure
-                heuristic_value -= (len(stack) - i)
-
-        # Handle the last block in the stack
-        if stack:
-            last_block = stack[-1]
-            if correct_support.get(last_block) is None:
-                # Correct support for the last block
-                heuristic_value += 1
-            else:
-                # Incorrect support for the last block
-                heuristic_value -= 1
 
-    return heuristic_value
+    For many evaluations against the same goal, build a SupportHeuristic once instead.
+    """
+    return SupportHeuristic(goal_state)(state)
 
 
 # Driver Code
@@ -1,10 +1,56 @@
+import mmap
+import random
+import sys
+import time
+from array import array
+from functools import lru_cache
+
+
+@lru_cache(maxsize=None)
+def line_masks(rows, cols, k):
+    """
+    Bit masks of every line of k cells (row, column or diagonal) on a rows x cols board.
+    Cell (r, c) is bit r * cols + c.
+    """
+    masks = []
+    for r in range(rows):
+        for c in range(cols):
+            for dr, dc in [(0, 1), (1, 0), (1, 1), (1, -1)]:  # Right, down, and both diagonals
+                end_r, end_c = r + dr * (k - 1), c + dc * (k - 1)
+                if 0 <= end_r < rows and 0 <= end_c < cols:
+                    mask = 0
+                    for step in range(k):
+                        mask |= 1 << ((r + dr * step) * cols + c + dc * step)
+                    masks.append(mask)
+    return tuple(masks)
+
+
+def evaluate_bitboards(lines, player_bits, opponent_bits):
+    """
+    Heuristic e(p) on bitboards: lines free of opponent marks minus lines free of player marks.
+    """
+    open_for_player = 0
+    open_for_opponent = 0
+    for mask in lines:
+        if not mask & opponent_bits:
+            open_for_player += 1
+        if not mask & player_bits:
+            open_for_opponent += 1
+    return open_for_player - open_for_opponent
+
+
 class TicTacToe:
-    def __init__(self, board):
+    def __init__(self, board, k=None):
         """
         Initialize the Tic-Tac-Toe board.
-        The board is represented as a 3x3 list of lists.
+        The board is represented as a 3x3 list of lists; any m x n board works,
+        with k in a row (default: the shorter side) making a line.
         """
         self.board = board
+        self.rows = len(board)
+        self.cols = len(board[0])
+        self.k = k if k is not None else min(self.rows, self.cols)
+        self.lines = line_masks(self.rows, self.cols, self.k)
 
     def is_open_line(self, line, player, opponent):
         """
@@ -14,46 +60,414 @@ class TicTacToe:
         """
         return all(cell == player or cell == ' ' for cell in line) and opponent not in line
 
+    def bitboard(self, symbol):
+        """
+        Bit mask of the cells holding `symbol` (cell (r, c) is bit r * cols + c).
+        """
+        bits = 0
+        for r, row in enumerate(self.board):
+            for c, cell in enumerate(row):
+                if cell == symbol:
+                    bits |= 1 << (r * self.cols + c)
+        return bits
+
     def calculate_heuristic(self, player, opponent):
         """
         Calculate the heuristic value of the board for the player.
         e(p) = (No. of complete rows, columns, or diagonals open for the player) -
                (No. of complete rows, columns, or diagonals open for the opponent)
+        On larger boards a "line" is any k consecutive cells in a row, column or diagonal.
         """
-        open_for_player = 0
-        open_for_opponent = 0
-
-        # Check rows
+        # Anything other than a side's own mark or a blank closes a line for that side
+        blocked_for_player = 0
+        blocked_for_opponent = 0
+        bit = 1
         for row in self.board:
-            if self.is_open_line(row, player, opponent):
-                open_for_player += 1
-            if self.is_open_line(row, opponent, player):
-                open_for_opponent += 1
-
-        # Check columns
-        for col in range(3):
-            column = [self.board[row][col] for row in range(3)]
-            if self.is_open_line(column, player, opponent):
-                open_for_player += 1
-            if self.is_open_line(column, opponent, player):
-                open_for_opponent += 1
-
-        # Check diagonals
-        diagonal1 = [self.board[i][i] for i in range(3)]  # Top-left to bottom-right
-        diagonal2 = [self.board[i][2 - i] for i in range(3)]  # Top-right to bottom-left
-        if self.is_open_line(diagonal1, player, opponent):
-            open_for_player += 1
-        if self.is_open_line(diagonal1, opponent, player):
-            open_for_opponent += 1
-        if self.is_open_line(diagonal2, player, opponent):
-            open_for_player += 1
-        if self.is_open_line(diagonal2, opponent, player):
-            open_for_opponent += 1
+            for cell in row:
+                if cell != ' ':
+                    if cell != player:
+                        blocked_for_player |= bit
+                    if cell != opponent:
+                        blocked_for_opponent |= bit
+                bit <<= 1
 
         # Calculate heuristic
-        heuristic = open_for_player - open_for_opponent
+        heuristic = evaluate_bitboards(self.lines, blocked_for_opponent, blocked_for_player)
         return heuristic
 
+    def best_move(self, player, opponent, max_depth=None, time_limit=None, searcher=None):
+        """
+        Choose a move for the player with alpha-beta search, using the heuristic
+        at the depth limit. Returns ((row, col), value), with (row, col) None if
+        the game is over. Pass the same AlphaBetaSearch as `searcher` to keep its
+        transposition table between moves.
+        """
+        if searcher is None:
+            searcher = AlphaBetaSearch(self.rows, self.cols, self.k)
+        cell, value, _ = searcher.search(self.bitboard(player), self.bitboard(opponent), max_depth, time_limit)
+        if cell is None:
+            return None, value
+        return divmod(cell, self.cols), value
+
+    def solved_move(self, player, opponent, table):
+        """
+        Look up the player's best move in a solved EndgameTable (3x3 only).
+        Returns ((row, col) or None, value, plies to the end), with value 1 for a
+        win, 0 for a draw and -1 for a loss under perfect play.
+        """
+        if (self.rows, self.cols, self.k) != (3, 3, 3):
+            raise ValueError("The endgame table only covers the 3x3 board")
+        result = table.probe(self.bitboard(player), self.bitboard(opponent))
+        if result is None:
+            raise ValueError("The board is not a legal position with the player to move")
+        value, cell, distance = result
+        return (None if cell is None else divmod(cell, 3)), value, distance
+
+
+# Transposition table entry flags
+EXACT, LOWER_BOUND, UPPER_BOUND = 0, 1, 2
+
+
+class SearchTimeout(Exception):
+    """Raised inside the search when the per-move time budget runs out."""
+
+
+class AlphaBetaSearch:
+    def __init__(self, rows=3, cols=3, k=None, table_size=1 << 16, seed=0):
+        """
+        Negamax alpha-beta search for m,n,k games on bitboards.
+        - table_size: Number of transposition table slots (the table never grows).
+        - seed: Seed for the Zobrist keys, so runs are reproducible.
+        """
+        self.rows = rows
+        self.cols = cols
+        self.k = k if k is not None else min(rows, cols)
+        self.cells = rows * cols
+        self.full = (1 << self.cells) - 1
+        self.lines = line_masks(rows, cols, self.k)
+        # Heuristic values never exceed the number of lines, so wins always outrank them
+        self.win_score = 1000 + len(self.lines)
+
+        # Lines through each cell, to test for a win after a move
+        self.lines_through = [[mask for mask in self.lines if mask >> cell & 1] for cell in range(self.cells)]
+        # Static move order: cells on more lines (the centre) first
+        self.move_order = sorted(range(self.cells), key=lambda cell: -len(self.lines_through[cell]))
+
+        # Board symmetries as cell permutations (8 on a square board, 4 otherwise)
+        coordinates = [(r, c) for r in range(rows) for c in range(cols)]
+        transforms = [lambda r, c: (r, c), lambda r, c: (r, cols - 1 - c),
+                      lambda r, c: (rows - 1 - r, c), lambda r, c: (rows - 1 - r, cols - 1 - c)]
+        if rows == cols:
+            transforms += [lambda r, c: (c, r), lambda r, c: (c, rows - 1 - r),
+                           lambda r, c: (cols - 1 - c, r), lambda r, c: (cols - 1 - c, rows - 1 - r)]
+        self.symmetries = []
+        for transform in transforms:
+            self.symmetries.append([nr * cols + nc for nr, nc in (transform(r, c) for r, c in coordinates)])
+        self.inverses = []
+        for permutation in self.symmetries:
+            inverse = [0] * self.cells
+            for cell, image in enumerate(permutation):
+                inverse[image] = cell
+            self.inverses.append(inverse)
+
+        # Zobrist keys per side and cell, plus one for the side to move
+        rng = random.Random(seed)
+        self.zobrist = [[rng.getrandbits(64) for _ in range(self.cells)] for _ in range(2)]
+        self.side_key = rng.getrandbits(64)
+
+        self.table_size = table_size
+        self.table = [None] * table_size  # Slots of (key, depth, flag, value, canonical move)
+        self.history = [0] * self.cells
+        self.nodes = 0
+        self.deadline = None
+        self.root_move = None
+
+    def hashes(self, first_bits, second_bits, side):
+        """
+        Zobrist hash of a position under every symmetry.
+        first_bits/second_bits are the marks of the sides numbered 0 and 1; `side` is to move.
+        """
+        hashes = []
+        for permutation in self.symmetries:
+            h = self.side_key if side else 0
+            for cell in range(self.cells):
+                if first_bits >> cell & 1:
+                    h ^= self.zobrist[0][permutation[cell]]
+                elif second_bits >> cell & 1:
+                    h ^= self.zobrist[1][permutation[cell]]
+            hashes.append(h)
+        return hashes
+
+    def is_win(self, bits):
+        """
+        Check if `bits` contains a complete line.
+        """
+        return any(mask & bits == mask for mask in self.lines)
+
+    def search(self, player_bits, opponent_bits, max_depth=None, time_limit=None):
+        """
+        Choose a move for the side owning player_bits by iterative deepening.
+        Returns (cell, value, depth reached); the cell is None if the game is over.
+        With a time_limit (seconds), the best move of the last completed depth is kept.
+        """
+        empty = self.full & ~(player_bits | opponent_bits)
+        if max_depth is None:
+            max_depth = bin(empty).count("1")
+        if not empty or self.is_win(player_bits) or self.is_win(opponent_bits):
+            return None, evaluate_bitboards(self.lines, player_bits, opponent_bits), 0
+
+        self.deadline = None if time_limit is None else time.perf_counter() + time_limit
+        self.nodes = 0
+        hashes = self.hashes(player_bits, opponent_bits, 0)
+        best_move, best_value, reached = None, 0, 0
+        for depth in range(1, max_depth + 1):
+            try:
+                value, move = self.root(player_bits, opponent_bits, hashes, depth)
+            except SearchTimeout:
+                break
+            best_move, best_value, reached = move, value, depth
+            if abs(value) >= self.win_score - self.cells:
+                break  # Proven win or loss; deeper search cannot change it
+        if best_move is None:
+            best_move = next(cell for cell in self.move_order if empty >> cell & 1)
+        return best_move, best_value, reached
+
+    def root(self, me, opponent, hashes, depth):
+        """
+        Search the root position to `depth`, returning (value, best cell).
+        """
+        value = self.negamax(me, opponent, 0, hashes, depth, -self.win_score - 1, self.win_score + 1, 0)
+        return value, self.root_move
+
+    def ordered_moves(self, empty, tt_move):
+        """
+        Empty cells with the transposition table move first, then by history score.
+        """
+        moves = [cell for cell in self.move_order if empty >> cell & 1 and cell != tt_move]
+        moves.sort(key=lambda cell: -self.history[cell])
+        if tt_move is not None:
+            moves.insert(0, tt_move)
+        return moves
+
+    def negamax(self, me, opponent, side, hashes, depth, alpha, beta, ply):
+        """
+        Value of the position for the side to move (owning `me`), within [alpha, beta].
+        """
+        self.nodes += 1
+        if self.deadline is not None and self.nodes & 1023 == 0 and time.perf_counter() > self.deadline:
+            raise SearchTimeout
+
+        empty = self.full & ~(me | opponent)
+        if not empty:
+            return 0  # Draw: the board is full and the last move did not win
+        if depth == 0:
+            return evaluate_bitboards(self.lines, me, opponent)
+
+        # Probe the transposition table under the canonical (smallest) symmetric hash
+        key = min(hashes)
+        symmetry = hashes.index(key)
+        slot = key % self.table_size
+        entry = self.table[slot]
+        tt_move = None
+        if entry is not None and entry[0] == key:
+            tt_move = self.inverses[symmetry][entry[4]]
+            if entry[1] >= depth and ply > 0:  # The root must search to report its move
+                value = self.from_table(entry[3], ply)
+                if entry[2] == EXACT:
+                    return value
+                if entry[2] == LOWER_BOUND and value >= beta:
+                    return value
+                if entry[2] == UPPER_BOUND and value <= alpha:
+                    return value
+
+        original_alpha = alpha
+        best_value = -self.win_score - 1
+        best_move = None
+        keys = self.zobrist[side]
+        for cell in self.ordered_moves(empty, tt_move):
+            moved = me | (1 << cell)
+            if any(mask & moved == mask for mask in self.lines_through[cell]):
+                value = self.win_score - (ply + 1)  # Winning move: faster wins score higher
+            else:
+                child_hashes = [h ^ keys[permutation[cell]] ^ self.side_key
+                                for h, permutation in zip(hashes, self.symmetries)]
+                value = -self.negamax(opponent, moved, 1 - side, child_hashes, depth - 1, -beta, -alpha, ply + 1)
+            if value > best_value:
+                best_value, best_move = value, cell
+            if value > alpha:
+                alpha = value
+            if alpha >= beta:
+                self.history[cell] += depth * depth
+                break
+
+        if best_value <= original_alpha:
+            flag = UPPER_BOUND
+        elif best_value >= beta:
+            flag = LOWER_BOUND
+        else:
+            flag = EXACT
+        # Depth-preferred replacement: keep a deeper entry for another position
+        if ply == 0:
+            self.root_move = best_move
+        if entry is None or entry[0] == key or depth >= entry[1]:
+            self.table[slot] = (key, depth, flag, self.to_table(best_value, ply),
+                                self.symmetries[symmetry][best_move])
+        return best_value
+
+    def to_table(self, value, ply):
+        """
+        Store win/loss scores relative to the stored position rather than the root.
+        """
+        if value >= self.win_score - self.cells:
+            return value + ply
+        if value <= -(self.win_score - self.cells):
+            return value - ply
+        return value
+
+    def from_table(self, value, ply):
+        """
+        Inverse of to_table.
+        """
+        if value >= self.win_score - self.cells:
+            return value - ply
+        if value <= -(self.win_score - self.cells):
+            return value + ply
+        return value
+
+
+ENDGAME_MAGIC = b"TTT1"
+NO_ENTRY = 0xFFFF  # Rank of a position that cannot occur in a game
+NO_MOVE = 15
+
+
+class EndgameTable:
+    def __init__(self, entries=None):
+        """
+        Solved 3x3 Tic-Tac-Toe: game value, best move and distance to the end of
+        every legal position, for the side to move.
+
+        A position is ranked in base 3 with cell i worth 3**i times 1 for the side
+        to move and 2 for the other side. Each entry packs value + 1 (2 bits), the
+        best cell (4 bits, 15 for none) and the number of plies left (4 bits).
+        """
+        self.lines = line_masks(3, 3, 3)
+        self.entries = entries
+        self._mmap = None
+        # Base-3 rank of every 9-bit mask when its cells are 1s, so rank is two lookups
+        self.mask_rank = [sum(3 ** cell for cell in range(9) if mask >> cell & 1) for mask in range(512)]
+
+    def rank(self, mover_bits, other_bits):
+        """
+        Base-3 rank of a position from the side to move's point of view.
+        """
+        return self.mask_rank[mover_bits] + 2 * self.mask_rank[other_bits]
+
+    def build(self):
+        """
+        Enumerate every legal position from the empty board, then solve them by
+        retrograde analysis: positions are resolved from full boards back to the
+        empty one, each from its already solved children.
+        """
+        full = 0x1FF
+        is_win = lambda bits: any(mask & bits == mask for mask in self.lines)
+
+        # Forward pass: every reachable position, grouped by number of marks
+        layers = [set() for _ in range(10)]
+        layers[0].add((0, 0))
+        for marks in range(9):
+            for mover, other in layers[marks]:
+                if is_win(other):
+                    continue  # Game already over
+                empty = full & ~(mover | other)
+                for cell in range(9):
+                    if empty >> cell & 1:
+                        layers[marks + 1].add((other, mover | (1 << cell)))
+
+        # Backward pass: solve the deepest layer first
+        entries = array("H", [NO_ENTRY]) * (3 ** 9)
+        for marks in range(9, -1, -1):
+            for mover, other in layers[marks]:
+                if is_win(other):
+                    value, move, distance = -1, NO_MOVE, 0  # The previous move won
+                elif marks == 9:
+                    value, move, distance = 0, NO_MOVE, 0  # Full board, no winner
+                else:
+                    best = None
+                    empty = full & ~(mover | other)
+                    for cell in range(9):
+                        if empty >> cell & 1:
+                            child_value, _, child_distance = self.unpack(
+                                entries[self.rank(other, mover | (1 << cell))])
+                            # Prefer higher values, then faster wins and slower losses
+                            candidate = (-child_value, -(child_distance + 1) if child_value < 0
+                                         else child_distance + 1, cell)
+                            if best is None or candidate > best:
+                                best = candidate
+                    value, distance, move = best[0], abs(best[1]), best[2]
+                entries[self.rank(mover, other)] = (value + 1) | (move << 2) | (distance << 6)
+        self.entries = entries
+        return self
+
+    @staticmethod
+    def unpack(entry):
+        """
+        Split a packed entry into (value, best cell or None, distance).
+        """
+        move = entry >> 2 & 15
+        return (entry & 3) - 1, (None if move == NO_MOVE else move), entry >> 6
+
+    def probe(self, mover_bits, other_bits):
+        """
+        (value, best cell, distance) of a position for the side to move, or None
+        if the position cannot occur in a game.
+        """
+        entry = self.entries[self.mask_rank[mover_bits] + 2 * self.mask_rank[other_bits]]
+        if entry == NO_ENTRY:
+            return None
+        return self.unpack(entry)
+
+    def save(self, path):
+        """
+        Write the table: magic followed by 3**9 little-endian 16-bit entries.
+        """
+        entries = array("H", self.entries)
+        if sys.byteorder == "big":
+            entries.byteswap()
+        with open(path, "wb") as handle:
+            handle.write(ENDGAME_MAGIC)
+            handle.write(entries.tobytes())
+
+    @classmethod
+    def load(cls, path):
+        """
+        Load a saved table by memory-mapping it read-only.
+        """
+        with open(path, "rb") as handle:
+            mapped = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        if mapped[:4] != ENDGAME_MAGIC:
+            mapped.close()
+            raise ValueError(f"{path} is not a Tic-Tac-Toe endgame table")
+        table = cls()
+        if sys.byteorder == "big":
+            entries = array("H", mapped[4:])
+            entries.byteswap()
+            mapped.close()
+            table.entries = entries
+        else:
+            table._mmap = mapped
+            table.entries = memoryview(mapped)[4:].cast("H")
+        return table
+
+    def close(self):
+        """
+        Release the memory map of a loaded table.
+        """
+        if self._mmap is not None:
+            self.entries.release()
+            self.entries = None
+            self._mmap.close()
+            self._mmap = None
+
 
 # Driver Code
 if __name__ == "__main__":
@@ -79,3 +493,12 @@ if __name__ == "__main__":
     for row in board:
         print(row)
     print(f"\nHeuristic Value for player '{player}': {heuristic_value}")
+
+    # Search for the best move
+    move, value = ttt.best_move(player, opponent)
+    print(f"Best move for player '{player}': {move} (value {value})")
+
+    # Answer the same question from the solved endgame table
+    table = EndgameTable().build()
+    move, value, distance = ttt.solved_move(player, opponent, table)
+    print(f"Solved: move {move}, value {value}, {distance} plies to the end")
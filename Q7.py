@@ -1,26 +1,71 @@
 import heapq
+import multiprocessing
+import os
+import time
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from operator import itemgetter
+from queue import Empty
+
+from external_bfs import external_bfs
+from search import BucketFrontier, Problem, graph_search
 
 class Puzzle:
-    def __init__(self, initial_state, goal_state):
+    def __init__(self, initial_state, goal_state, pattern_db=None):
         """
         Initialize the Puzzle problem with an initial and goal state.
+        An optional pattern_db (see pattern_db.PatternDatabase) replaces Manhattan Distance as the heuristic.
         """
         self.initial_state = initial_state
         self.goal_state = goal_state
+        self.pattern_db = pattern_db
         self.n = len(goal_state)  # Size of the grid (3x3 for 8 puzzle)
+        self.size = self.n * self.n
+
+        # Goal position of every tile, so the heuristic never searches the goal board
+        self.goal_positions = {}
+        for i, row in enumerate(goal_state):
+            for j, value in enumerate(row):
+                self.goal_positions[value] = (i, j)
+
+        # Compact mode packs a board into one int: 4 bits per tile for the 8 and 15 puzzles
+        self.bits = max(4, (self.size - 1).bit_length())
+        self.mask = (1 << self.bits) - 1
+
+        # Manhattan distance of each tile from each cell (the blank tile always scores 0)
+        self.distance_table = [[0] * self.size for _ in range(self.size)]
+        for value, (goal_x, goal_y) in self.goal_positions.items():
+            if value != 0:
+                for cell in range(self.size):
+                    x, y = divmod(cell, self.n)
+                    self.distance_table[value][cell] = abs(goal_x - x) + abs(goal_y - y)
+
+        # Cells the blank can slide to from each cell, in Up, Down, Left, Right order
+        self.blank_moves = []
+        for cell in range(self.size):
+            x, y = divmod(cell, self.n)
+            targets = []
+            for dx, dy in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
+                nx, ny = x + dx, y + dy
+                if 0 <= nx < self.n and 0 <= ny < self.n:
+                    targets.append(nx * self.n + ny)
+            self.blank_moves.append(targets)
 
     def heuristic(self, state):
         """
         Calculate the heuristic value (Manhattan Distance).
         Manhattan Distance is the sum of the distances of tiles from their goal positions.
         """
+        if self.pattern_db is not None:
+            return self.pattern_db.heuristic([val for row in state for val in row])
+
         distance = 0
         for i in range(self.n):
             for j in range(self.n):
                 value = state[i][j]
                 if value != 0:  # Ignore the blank tile (0)
                     # Find goal position of the current tile
-                    goal_x, goal_y = divmod(self.goal_state.index(value), self.n)
+                    goal_x, goal_y = self.goal_positions[value]
                     current_x, current_y = i, j
                     distance += abs(goal_x - current_x) + abs(goal_y - current_y)
         return distance
@@ -52,59 +97,579 @@ class Puzzle:
         """
         return state == self.goal_state
 
-    def solve(self):
+    def pack(self, state):
+        """
+        Pack a board (list of lists) into a single int, one tile per `bits` wide field.
+        Cell k (row-major) occupies bits [k * bits, (k + 1) * bits).
+        """
+        packed = 0
+        for cell, value in enumerate(val for row in state for val in row):
+            packed |= value << (cell * self.bits)
+        return packed
+
+    def unpack(self, packed):
+        """
+        Unpack a packed board back into a list of lists.
+        """
+        flat = [(packed >> (cell * self.bits)) & self.mask for cell in range(self.size)]
+        return [flat[i * self.n:(i + 1) * self.n] for i in range(self.n)]
+
+    def packed_heuristic(self, packed):
+        """
+        Manhattan Distance of a packed board, using the precomputed distance table.
+        """
+        if self.pattern_db is not None:
+            return self.pattern_db.heuristic([(packed >> (cell * self.bits)) & self.mask
+                                              for cell in range(self.size)])
+
+        distance = 0
+        for cell in range(self.size):
+            distance += self.distance_table[(packed >> (cell * self.bits)) & self.mask][cell]
+        return distance
+
+    def solve(self, compact=False):
         """
         Solve the 8 Puzzle Problem using the A* algorithm.
+        With compact=True boards are searched as packed ints (see solve_compact).
         """
-        # Priority queue (min-heap)
-        open_list = []
-        # Closed list to track visited states
-        closed_set = set()
+        if compact:
+            return self.solve_compact()
 
-        # Initial state with heuristic and cost
-        initial_state = self.initial_state
-        heapq.heappush(open_list, (self.heuristic(initial_state), 0, initial_state, None))
+        # Boards are keyed by their tuple of row tuples; the heap frontier breaks
+        # f ties by insertion order, so boards are never compared
+        problem = Problem(self.initial_state, self.get_neighbors, self.is_goal,
+                          key=lambda state: tuple(map(tuple, state)), heuristic=self.heuristic)
+        return graph_search(problem, "A*")
 
-        # Parent mapping for reconstructing the path
-        parent_map = {}
+    def compact_problem(self):
+        """
+        This puzzle as a search.Problem over (packed board, blank cell) states keyed by
+        the packed board. The blank position travels with each board and the heuristic
+        is updated from the single tile that moves, so an expansion costs O(1) per neighbor.
+        """
+        start = self.pack(self.initial_state)
+        goal = self.pack(self.goal_state)
+        blank = next(i * self.n + j for i, row in enumerate(self.initial_state)
+                     for j, val in enumerate(row) if val == 0)
 
-        while open_list:
-            # Get the state with the lowest f = g + h
-            _, cost, current_state, parent = heapq.heappop(open_list)
+        bits, mask, distance_table = self.bits, self.mask, self.distance_table
+        blank_moves, pattern_db = self.blank_moves, self.pattern_db
 
-            # Check if the goal is reached
-            if self.is_goal(current_state):
-                parent_map[tuple(map(tuple, current_state))] = parent
-                return self.reconstruct_path(parent_map, current_state)
+        def expand(state, h_cost):
+            current, blank = state
+            blank_shift = blank * bits
+            neighbors = []
+            for target in blank_moves[blank]:
+                # Slide the tile at `target` into the blank cell
+                shift = target * bits
+                tile = (current >> shift) & mask
+                neighbor = current - (tile << shift) + (tile << blank_shift)
+                if pattern_db is None:
+                    neighbor_h = h_cost + distance_table[tile][blank] - distance_table[tile][target]
+                else:
+                    neighbor_h = self.packed_heuristic(neighbor)
+                neighbors.append(((neighbor, target), 1, neighbor_h))
+            return neighbors
 
-            # If already visited, skip
-            if tuple(map(tuple, current_state)) in closed_set:
-                continue
+        def successors(state):
+            # The same moves without the heuristic, for BFS and DFS
+            current, blank = state
+            blank_shift = blank * bits
+            neighbors = []
+            for target in blank_moves[blank]:
+                shift = target * bits
+                tile = (current >> shift) & mask
+                neighbors.append((current - (tile << shift) + (tile << blank_shift), target))
+            return neighbors
+
+        return Problem((start, blank), successors, lambda state: state[0] == goal, key=itemgetter(0),
+                       heuristic=lambda state: self.packed_heuristic(state[0]), expand=expand)
+
+    def solve_compact(self, frontier=None):
+        """
+        Solve the puzzle using A* over packed int boards (see compact_problem).
+        f-values are small integers, so the open list defaults to a bucket queue that
+        expands the deepest board first among equal f (see search.BucketFrontier).
+        Sets nodes_expanded.
+        """
+        if frontier is None:
+            frontier = BucketFrontier()
+        closed = {}
+        path = graph_search(self.compact_problem(), "A*", frontier=frontier, closed=closed)
+        self.nodes_expanded = len(closed)
+        if path is None:
+            return None  # No solution found
+        return [self.unpack(packed) for packed, _ in path]
+
+    def is_solvable(self):
+        """
+        Check whether the goal is reachable from the initial state.
+        Each slide is a transposition that moves the blank one cell, so the
+        permutation parity must match the parity of the blank's Manhattan distance.
+        """
+        tiles = [val for row in self.initial_state for val in row]
+        # Follow the permutation that sends every cell's tile to its goal cell
+        target = [self.goal_positions[value][0] * self.n + self.goal_positions[value][1] for value in tiles]
+        seen = [False] * self.size
+        transpositions = 0
+        for cell in range(self.size):
+            length = 0
+            while not seen[cell]:
+                seen[cell] = True
+                cell = target[cell]
+                length += 1
+            if length:
+                transpositions += length - 1
+        blank_x, blank_y = divmod(tiles.index(0), self.n)
+        goal_x, goal_y = self.goal_positions[0]
+        return transpositions % 2 == (abs(blank_x - goal_x) + abs(blank_y - goal_y)) % 2
+
+    def solve_ida(self, max_nodes=None):
+        """
+        Solve the puzzle using Iterative Deepening A* (IDA*).
+        Memory is linear in the solution depth: a single flat board is modified
+        in place (move/undo) and only the current path of blank cells is kept.
+        Stops and returns None once more than max_nodes nodes have been expanded.
+        """
+        if not self.is_solvable():
+            return None
+
+        tiles = [val for row in self.initial_state for val in row]
+        goal_tiles = [val for row in self.goal_state for val in row]
+        distance_table = self.distance_table
+        blank_moves = self.blank_moves
+        path = [tiles.index(0)]  # Blank cell after each move
+
+        # With a pattern database, track tile cells and per-partition values so
+        # a move only re-ranks the partition of the tile that moved
+        pattern_db = self.pattern_db
+        if pattern_db is not None:
+            positions = [0] * self.size
+            for cell, value in enumerate(tiles):
+                positions[value] = cell
+            values = [pattern_db.partition_value(index, positions)
+                      for index in range(len(pattern_db.partitions))]
+        self.nodes_expanded = 0
+        found = -1
+
+        def search(blank, cost, h_cost, bound, previous):
+            f_cost = cost + h_cost
+            if f_cost > bound:
+                return f_cost
+            if h_cost == 0 and tiles == goal_tiles:
+                return found
+            self.nodes_expanded += 1
+            if max_nodes is not None and self.nodes_expanded > max_nodes:
+                raise StopIteration
+            minimum = float("inf")
+            for target in blank_moves[blank]:
+                if target == previous:  # Never undo the move that led here
+                    continue
+                tile = tiles[target]
+                # Move: slide the tile into the blank cell
+                tiles[blank], tiles[target] = tile, 0
+                path.append(target)
+                if pattern_db is None:
+                    child_h = h_cost + distance_table[tile][blank] - distance_table[tile][target]
+                else:
+                    positions[tile] = blank
+                    partition = pattern_db.partition_of[tile]
+                    child_h = h_cost
+                    if partition is not None:
+                        saved = values[partition]
+                        values[partition] = pattern_db.partition_value(partition, positions)
+                        child_h += values[partition] - saved
+                t = search(target, cost + 1, child_h, bound, blank)
+                if t == found:
+                    return found
+                # Undo the move
+                path.pop()
+                tiles[blank], tiles[target] = 0, tile
+                if pattern_db is not None:
+                    positions[tile] = target
+                    if partition is not None:
+                        values[partition] = saved
+                if t < minimum:
+                    minimum = t
+            return minimum
+
+        start_h = self.heuristic(self.initial_state)
+        bound = start_h
+        try:
+            while True:
+                t = search(path[0], 0, start_h, bound, None)
+                if t == found:
+                    break
+                bound = t
+        except StopIteration:
+            return None
+
+        # Replay the blank cells from the initial board to build the solution path
+        board = [val for row in self.initial_state for val in row]
+        solution = [self.initial_state]
+        for blank, target in zip(path, path[1:]):
+            board[blank], board[target] = board[target], 0
+            solution.append([board[i * self.n:(i + 1) * self.n] for i in range(self.n)])
+        return solution
+
+    def solve_hda(self, workers=None, batch_size=1000):
+        """
+        Solve the puzzle with Hash-Distributed A* (HDA*) across worker processes.
+        Every packed board is owned by one worker (by hash), which keeps its open
+        list and best path costs. The search runs in rounds: each worker expands up to
+        batch_size boards with f below the best solution cost found so far, then
+        sends exactly one batch of generated boards to every other worker (through
+        that worker's queue) and receives one from each. The search ends once the
+        smallest f in any open list is no less than the best solution cost, which
+        makes the solution optimal (Manhattan Distance and the additive pattern_db are
+        both consistent; workers get the pattern_db when the puzzle has one). The path
+        is then rebuilt by asking the owner of each board for its parent.
+        Sets nodes_expanded (over all workers); returns None if there is no solution.
+        Raises RuntimeError if a worker process dies.
+        """
+        if not self.is_solvable():
+            return None
+        if workers is None:
+            workers = os.cpu_count()
+        start = self.pack(self.initial_state)
+        goal = self.pack(self.goal_state)
+
+        commands = [multiprocessing.Queue() for _ in range(workers)]
+        inboxes = [multiprocessing.Queue() for _ in range(workers)]
+        reports = multiprocessing.Queue()
+        processes = [multiprocessing.Process(target=_hda_worker, daemon=True,
+                                             args=(index, self.initial_state, self.goal_state, self.pattern_db,
+                                                   commands[index], inboxes, reports, batch_size))
+                     for index in range(workers)]
+        for process in processes:
+            process.start()
+
+        try:
+            incumbent = float("inf")  # Cost of the best solution found so far
+            while True:
+                for queue in commands:
+                    queue.put(("round", incumbent))
+                minimum, expanded = float("inf"), 0
+                for _ in range(workers):
+                    open_minimum, goal_cost, worker_expanded = _hda_receive(reports, processes)
+                    minimum = min(minimum, open_minimum)
+                    incumbent = min(incumbent, goal_cost)
+                    expanded += worker_expanded
+                if minimum >= incumbent:
+                    break
+            self.nodes_expanded = expanded
+
+            # Follow the parent boards back from the goal, asking each board's owner
+            path = [goal]
+            while path[-1] != start:
+                commands[_owner(path[-1], workers)].put(("parent", path[-1]))
+                path.append(_hda_receive(reports, processes))
+            return [self.unpack(packed) for packed in reversed(path)]
+        finally:
+            for queue in commands:
+                queue.put(("stop",))
+            for process in processes:
+                # A worker waiting on a batch from a dead peer never sees "stop"
+                process.join(timeout=1.0)
+                if process.is_alive():
+                    process.terminate()
+                    process.join()
+
+    def enumerate_layers(self, directory=None, chunk_records=1 << 18, fan_in=64):
+        """
+        Enumerate every board reachable from the initial state with a disk-backed
+        breadth-first search (see external_bfs.external_bfs), so memory stays bounded
+        by chunk_records and fan_in. Boards are stored as their packed ints in big-endian bytes,
+        which sort like the ints. Returns the layer sizes, state count and diameter.
+        """
+        bits, mask, size, blank_moves = self.bits, self.mask, self.size, self.blank_moves
+        record_size = (size * bits + 7) // 8
 
-            # Mark as visited
-            closed_set.add(tuple(map(tuple, current_state)))
+        def successors(record):
+            current = int.from_bytes(record, "big")
+            blank = next(cell for cell in range(size) if (current >> (cell * bits)) & mask == 0)
+            blank_shift = blank * bits
+            neighbors = []
+            for target in blank_moves[blank]:
+                shift = target * bits
+                tile = (current >> shift) & mask
+                neighbors.append((current - (tile << shift) + (tile << blank_shift)).to_bytes(record_size, "big"))
+            return neighbors
 
-            # Add current state to parent map
-            parent_map[tuple(map(tuple, current_state))] = parent
+        start = self.pack(self.initial_state).to_bytes(record_size, "big")
+        return external_bfs([start], successors, record_size, directory=directory, chunk_records=chunk_records,
+                            fan_in=fan_in)
 
-            # Generate neighbors and add them to the open list
-            for neighbor in self.get_neighbors(current_state):
-                if tuple(map(tuple, neighbor)) not in closed_set:
-                    g_cost = cost + 1  # Increment cost for moving to the neighbor
-                    f_cost = g_cost + self.heuristic(neighbor)
-                    heapq.heappush(open_list, (f_cost, g_cost, neighbor, current_state))
 
-        return None  # No solution found
+def _owner(packed, workers):
+    """
+    Worker that owns a packed board in HDA*.
+    """
+    return hash((packed,)) % workers
 
-    def reconstruct_path(self, parent_map, state):
+
+def _hda_receive(reports, processes, poll_seconds=1.0):
+    """
+    Next report from the HDA* workers. Raises RuntimeError once a worker has died
+    rather than waiting forever for a report it will never send.
+    """
+    while True:
+        try:
+            return reports.get(timeout=poll_seconds)
+        except Empty:
+            for index, process in enumerate(processes):
+                if not process.is_alive():
+                    raise RuntimeError(f"HDA* worker {index} died (exit code {process.exitcode})")
+
+
+def _hda_worker(index, initial_state, goal_state, pattern_db, commands, inboxes, reports, batch_size):
+    """
+    One HDA* worker (see Puzzle.solve_hda). Commands are ("round", incumbent),
+    ("parent", board) and ("stop",); each round ends with a report of
+    (smallest f in the open list, best goal cost seen, boards expanded so far).
+    """
+    puzzle = Puzzle(initial_state, goal_state, pattern_db)
+    bits, mask, distance_table, blank_moves = puzzle.bits, puzzle.mask, puzzle.distance_table, puzzle.blank_moves
+    workers = len(inboxes)
+    inbox = inboxes[index]
+    goal = puzzle.pack(goal_state)
+
+    best = {}  # Owned board -> (best path cost, parent board)
+    open_list = []  # Entries (f, -g, board, blank cell): deepest first among equal f
+    goal_cost = float("inf")
+    expanded = 0
+
+    def insert(f_cost, cost, packed, blank, parent):
+        nonlocal goal_cost
+        known = best.get(packed)
+        if known is None or cost < known[0]:
+            best[packed] = (cost, parent)
+            heapq.heappush(open_list, (f_cost, -cost, packed, blank))
+            if packed == goal and cost < goal_cost:
+                goal_cost = cost
+
+    start = puzzle.pack(initial_state)
+    if _owner(start, workers) == index:
+        blank = next(i * puzzle.n + j for i, row in enumerate(initial_state) for j, val in enumerate(row) if val == 0)
+        insert(puzzle.packed_heuristic(start), 0, start, blank, None)
+
+    while True:
+        command = commands.get()
+        if command[0] == "stop":
+            return
+        if command[0] == "parent":
+            reports.put(best[command[1]][1])
+            continue
+
+        incumbent = command[1]
+        outgoing = [[] for _ in range(workers)]
+        budget = batch_size
+        while open_list and budget and open_list[0][0] < incumbent:
+            f_cost, negative_cost, current, blank = heapq.heappop(open_list)
+            cost = -negative_cost
+            if best[current][0] != cost:
+                continue  # Stale entry: the board was reached more cheaply later
+            budget -= 1
+            expanded += 1
+            h_cost = f_cost - cost
+            blank_shift = blank * bits
+            for target in blank_moves[blank]:
+                shift = target * bits
+                tile = (current >> shift) & mask
+                neighbor = current - (tile << shift) + (tile << blank_shift)
+                if pattern_db is None:
+                    neighbor_h = h_cost + distance_table[tile][blank] - distance_table[tile][target]
+                else:
+                    neighbor_h = puzzle.packed_heuristic(neighbor)
+                entry = (cost + 1 + neighbor_h, cost + 1, neighbor, target, current)
+                owner = _owner(neighbor, workers)
+                if owner == index:
+                    insert(*entry)
+                else:
+                    outgoing[owner].append(entry)
+
+        # Exactly one message to and from every peer per round
+        for peer in range(workers):
+            if peer != index:
+                inboxes[peer].put(outgoing[peer])
+        for _ in range(workers - 1):
+            for entry in inbox.get():
+                insert(*entry)
+        reports.put((open_list[0][0] if open_list else float("inf"), goal_cost, expanded))
+
+
+# Fixed 15-puzzle instances for benchmark_hda (optimal solutions of 42 to 50 moves)
+FIFTEEN_PUZZLE_INSTANCES = [
+    [[7, 11, 0, 2], [6, 12, 8, 14], [10, 4, 15, 5], [9, 13, 3, 1]],
+    [[10, 5, 0, 1], [6, 2, 12, 3], [15, 8, 14, 11], [13, 9, 7, 4]],
+    [[13, 5, 3, 4], [10, 14, 7, 0], [11, 1, 8, 2], [9, 15, 12, 6]],
+    [[2, 15, 14, 7], [6, 0, 3, 10], [1, 9, 12, 11], [13, 5, 8, 4]],
+]
+
+
+def benchmark_hda(instances=None, worker_counts=(1, 2, 4), batch_size=1000):
+    """
+    Time Puzzle.solve_hda against the sequential compact solver on fixed 15-puzzle
+    instances. Returns one dict per instance with the solution length, the sequential
+    time and, per worker count, the HDA* time and speedup.
+    """
+    if instances is None:
+        instances = FIFTEEN_PUZZLE_INSTANCES
+    goal_state = [[1, 2, 3, 4], [5, 6, 7, 8], [9, 10, 11, 12], [13, 14, 15, 0]]
+    results = []
+    for initial_state in instances:
+        puzzle = Puzzle(initial_state, goal_state)
+        started = time.perf_counter()
+        moves = len(puzzle.solve_compact()) - 1
+        sequential = time.perf_counter() - started
+        result = {"moves": moves, "sequential_seconds": sequential, "parallel": {}}
+        for workers in worker_counts:
+            started = time.perf_counter()
+            path = puzzle.solve_hda(workers=workers, batch_size=batch_size)
+            elapsed = time.perf_counter() - started
+            if len(path) - 1 != moves:
+                raise AssertionError(f"HDA* found {len(path) - 1} moves instead of {moves}")
+            result["parallel"][workers] = {"seconds": elapsed, "speedup": sequential / elapsed}
+        results.append(result)
+    return results
+
+
+_batch_goal = None  # Goal board of a BatchSolver worker process
+
+
+def _init_batch_worker(goal_state):
+    global _batch_goal
+    _batch_goal = goal_state
+
+
+def _solve_packed(packed):
+    """
+    Worker side of BatchSolver: solve one packed start board against the worker's goal
+    and return the packed boards of the path, or None if it is unsolvable.
+    """
+    puzzle = Puzzle(_batch_goal, _batch_goal)
+    puzzle.initial_state = puzzle.unpack(packed)
+    if not puzzle.is_solvable():
+        return None
+    return [puzzle.pack(board) for board in puzzle.solve_compact()]
+
+
+class BatchSolver:
+    def __init__(self, goal_state, workers=None, cache_size=100000, max_pending=None):
         """
-        Reconstruct the solution path from the parent map.
+        Solve many start boards for one goal.
+        - goal_state: Goal board (list of lists).
+        - workers: Processes solving cache misses (default: one per CPU core).
+        - cache_size: Most boards kept in the LRU cache of solved paths.
+        - max_pending: Most misses in flight at once (default: 4 per worker).
+
+        Boards are canonicalized to packed ints (flat or nested, lists or tuples all
+        match). The cache maps a board to a solved path (a tuple of packed boards shared
+        by every board on it) and the board's offset in that path: every suffix of an
+        optimal path is optimal, so solving one board also answers every board along
+        its solution, and no entry depends on another surviving eviction. Boards that
+        were looked up are kept as most recently used; the rest of a path goes to the
+        least recently used end, goal first, so it is evicted before any looked-up board.
         """
-        path = []
-        while state is not None:
-            path.append(state)
-            state = parent_map[tuple(map(tuple, state))]
-        return path[::-1]  # Reverse the path
+        self.goal_state = [list(row) for row in goal_state]
+        self.puzzle = Puzzle(self.goal_state, self.goal_state)
+        self.workers = workers or os.cpu_count()
+        self.cache_size = cache_size
+        self.max_pending = max_pending or 4 * self.workers
+        self.cache = OrderedDict()  # Packed board -> (packed path, offset of the board), or None if unsolvable
+        self.hits = self.misses = self.duplicates = 0
+        self.pool = ProcessPoolExecutor(self.workers, initializer=_init_batch_worker, initargs=(self.goal_state,))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self.pool.shutdown()
+
+    def canonical(self, state):
+        """
+        Packed int of a board given flat or as rows.
+        """
+        flat = [val for row in state for val in row] if isinstance(state[0], (list, tuple)) else list(state)
+        n = self.puzzle.n
+        return self.puzzle.pack([flat[i * n:(i + 1) * n] for i in range(n)])
+
+    def lookup(self, packed):
+        """
+        Return (True, packed path) from the cache, (True, None) for a board cached as
+        unsolvable, or (False, None) on a miss.
+        """
+        if packed not in self.cache:
+            return False, None
+        self.cache.move_to_end(packed)
+        entry = self.cache[packed]
+        if entry is None:
+            return True, None
+        path, offset = entry
+        return True, list(path[offset:])
+
+    def store(self, packed, path):
+        """
+        Cache a solved path (or None for an unsolvable board), one entry per board on it.
+        """
+        if path is None:
+            self.cache[packed] = None
+        else:
+            path = tuple(path)
+            for offset in range(1, len(path)):
+                board = path[offset]
+                if board not in self.cache:  # Leave boards already cached where they are
+                    self.cache[board] = (path, offset)
+                    self.cache.move_to_end(board, last=False)
+            self.cache[packed] = (path, 0)
+        self.cache.move_to_end(packed)
+        while len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+
+    def solve_all(self, states):
+        """
+        Solve every board of an iterable (which may be a stream) and yield
+        (index in the input, solution path as boards) as results become available:
+        cache hits at once, misses as their worker finishes. Repeated boards are
+        solved once. The path is None for an unsolvable board.
+        """
+        futures = {}  # Future -> packed board it solves
+        waiting = {}  # Packed board in flight -> input indices waiting for it
+
+        for index, state in enumerate(states):
+            packed = self.canonical(state)
+            hit, path = self.lookup(packed)
+            if hit:
+                self.hits += 1
+                yield index, self.boards(path)
+                continue
+            if packed in waiting:
+                self.duplicates += 1
+                waiting[packed].append(index)
+                continue
+            self.misses += 1
+            waiting[packed] = [index]
+            futures[self.pool.submit(_solve_packed, packed)] = packed
+            yield from self.collect(futures, waiting, block=len(futures) >= self.max_pending)
+
+        while futures:
+            yield from self.collect(futures, waiting, block=True)
+
+    def collect(self, futures, waiting, block):
+        # Cache finished solutions and yield them to every input waiting on them
+        done, _ = wait(futures, timeout=None if block else 0, return_when=FIRST_COMPLETED)
+        for future in done:
+            packed = futures.pop(future)
+            path = future.result()
+            self.store(packed, path)
+            for index in waiting.pop(packed):
+                yield index, self.boards(path)
+
+    def boards(self, path):
+        return None if path is None else [self.puzzle.unpack(packed) for packed in path]
 
 
 # Driver Code
@@ -137,3 +702,20 @@ if __name__ == "__main__":
             print()
     else:
         print("No solution exists.")
+
+    # The same search spread over two processes with HDA*
+    solution = puzzle.solve_hda(workers=2)
+    print(f"HDA* with 2 workers: {len(solution) - 1} moves, {puzzle.nodes_expanded} boards expanded")
+
+    # A batch of scrambled boards (with repeats) through the cached batch solver
+    import random
+    boards = []
+    for _ in range(50):
+        tiles = [val for row in goal_state for val in row]
+        random.shuffle(tiles)
+        boards.append([tiles[0:3], tiles[3:6], tiles[6:9]])
+    boards += boards[:25]
+    with BatchSolver(goal_state, workers=2) as batch_solver:
+        solved = sum(path is not None for _, path in batch_solver.solve_all(boards))
+        print(f"Batch of {len(boards)} boards: {solved} solvable, {batch_solver.hits} cache hits, "
+              f"{batch_solver.misses} solved by workers")
@@ -1,25 +1,48 @@
+import multiprocessing
 import random
+import time
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is only needed by the batch_* methods
+    np = None
 
 class Puzzle:
-    def __init__(self, initial_state, goal_state):
+    def __init__(self, initial_state, goal_state, pattern_db=None):
         """
         Initialize the 8-puzzle problem with the given initial and goal states.
+        The goal may be flat or a list of lists. An optional pattern_db
+        (see pattern_db.PatternDatabase) replaces Manhattan Distance as the heuristic.
         """
         self.initial_state = initial_state
         self.goal_state = goal_state
-        self.n = len(goal_state)  # Size of the grid (3x3 for 8-puzzle)
+        self.pattern_db = pattern_db
+        self.evaluations = 0  # Heuristic evaluations so far
+        self._batch_tables = None  # NumPy tables, built by batch_tables on first use
+
+        # Flat goal layout and the goal position of every tile
+        if isinstance(goal_state[0], list):
+            self.goal_tiles = [val for row in goal_state for val in row]
+        else:
+            self.goal_tiles = list(goal_state)
+        self.n = int(round(len(self.goal_tiles) ** 0.5))  # Size of the grid (3x3 for 8-puzzle)
+        self.goal_positions = {value: divmod(index, self.n) for index, value in enumerate(self.goal_tiles)}
 
     def heuristic(self, state):
         """
         Calculate the heuristic value using Manhattan Distance.
         """
+        self.evaluations += 1
+        if self.pattern_db is not None:
+            return self.pattern_db.heuristic([val for row in state for val in row])
+
         distance = 0
         for i in range(self.n):
             for j in range(self.n):
                 value = state[i][j]
                 if value != 0:  # Ignore the blank tile (0)
                     # Find the target position of the current tile in the goal state
-                    goal_x, goal_y = divmod(self.goal_state.index(value), self.n)
+                    goal_x, goal_y = self.goal_positions[value]
                     current_x, current_y = i, j
                     distance += abs(goal_x - current_x) + abs(goal_y - current_y)
         return distance
@@ -49,16 +72,21 @@ class Puzzle:
         """
         Check if the current state is the goal state.
         """
-        return state == self.goal_state
+        return [val for row in state for val in row] == self.goal_tiles
 
-    def steepest_ascent(self):
+    def steepest_ascent(self, state=None, stop=None):
         """
         Solve the 8-puzzle problem using Steepest Ascent Hill Climbing.
+        Starts from `state` (default: the initial state); `stop` is an optional
+        callable checked every step to abandon the climb early.
         """
-        current_state = self.initial_state
+        current_state = self.initial_state if state is None else state
         current_heuristic = self.heuristic(current_state)
 
         while True:
+            if stop is not None and stop():
+                return current_state, current_heuristic
+
             neighbors = self.get_neighbors(current_state)
             best_neighbor = None
             best_heuristic = float("inf")
@@ -78,6 +106,160 @@ class Puzzle:
             current_state = best_neighbor
             current_heuristic = best_heuristic
 
+    def sideways_ascent(self, state=None, max_sideways=100, rng=random, stop=None):
+        """
+        Steepest Ascent Hill Climbing that may also take up to max_sideways
+        consecutive moves to an equally good neighbor (chosen at random among the
+        best), to walk across plateaus instead of stopping on them.
+        """
+        current_state = self.initial_state if state is None else state
+        current_heuristic = self.heuristic(current_state)
+        sideways = 0
+
+        while current_heuristic > 0:
+            if stop is not None and stop():
+                break
+            scored = [(self.heuristic(neighbor), neighbor) for neighbor in self.get_neighbors(current_state)]
+            best_heuristic = min(score for score, _ in scored)
+            if best_heuristic > current_heuristic:
+                break  # Strict local optimum
+            if best_heuristic == current_heuristic:
+                if sideways >= max_sideways:
+                    break
+                sideways += 1
+            else:
+                sideways = 0
+            current_state = rng.choice([neighbor for score, neighbor in scored if score == best_heuristic])
+            current_heuristic = best_heuristic
+
+        return current_state, current_heuristic
+
+    def first_choice(self, state=None, max_steps=1000, rng=random, stop=None):
+        """
+        Stochastic First-Choice Hill Climbing: try neighbors in random order and
+        move to the first one that is better, stopping when none is.
+        """
+        current_state = self.initial_state if state is None else state
+        current_heuristic = self.heuristic(current_state)
+
+        for _ in range(max_steps):
+            if current_heuristic == 0 or (stop is not None and stop()):
+                break
+            neighbors = self.get_neighbors(current_state)
+            rng.shuffle(neighbors)
+            for neighbor in neighbors:
+                neighbor_heuristic = self.heuristic(neighbor)
+                if neighbor_heuristic < current_heuristic:
+                    current_state, current_heuristic = neighbor, neighbor_heuristic
+                    break
+            else:
+                break  # No better neighbor: local optimum
+
+        return current_state, current_heuristic
+
+    def scramble(self, moves, rng=random):
+        """
+        Random walk of `moves` slides from the initial state, used as a restart point.
+        """
+        state = self.initial_state
+        for _ in range(moves):
+            state = rng.choice(self.get_neighbors(state))
+        return state
+
+    def batch_tables(self):
+        """
+        NumPy lookup tables for the batch methods, built on first use:
+        distance[tile, cell] is the Manhattan distance of a tile from its goal
+        (0 for the blank), and moves[cell] lists the cells the blank can slide
+        to (Up, Down, Left, Right), -1 where the move leaves the board.
+        """
+        if np is None:
+            raise ImportError("The batch hill-climbing methods require NumPy")
+        if self._batch_tables is None:
+            size = self.n * self.n
+            cell_x, cell_y = np.divmod(np.arange(size), self.n)
+            goal_x = np.zeros(size, dtype=np.int64)
+            goal_y = np.zeros(size, dtype=np.int64)
+            for value, (x, y) in self.goal_positions.items():
+                goal_x[value], goal_y[value] = x, y
+            distance = np.abs(goal_x[:, None] - cell_x[None, :]) + np.abs(goal_y[:, None] - cell_y[None, :])
+            distance[0, :] = 0  # Ignore the blank tile (0)
+
+            moves = np.full((size, 4), -1, dtype=np.int64)
+            for cell in range(size):
+                x, y = divmod(cell, self.n)
+                for k, (dx, dy) in enumerate([(-1, 0), (1, 0), (0, -1), (0, 1)]):
+                    if 0 <= x + dx < self.n and 0 <= y + dy < self.n:
+                        moves[cell, k] = (x + dx) * self.n + y + dy
+            self._batch_tables = distance, moves
+        return self._batch_tables
+
+    def boards_to_array(self, states):
+        """
+        Stack boards (lists of lists) into a 2-D array with one flat board per row.
+        """
+        if np is None:
+            raise ImportError("The batch hill-climbing methods require NumPy")
+        return np.array([[val for row in state for val in row] for state in states], dtype=np.int64)
+
+    def batch_heuristic(self, boards):
+        """
+        Manhattan Distance of every row of a 2-D board array in one vectorized pass.
+        """
+        distance, _ = self.batch_tables()
+        return distance[boards, np.arange(boards.shape[1])].sum(axis=1)
+
+    def batch_neighbors(self, boards, heuristics=None):
+        """
+        Heuristic of all (up to 4) neighbors of every board, without building them.
+        Returns (blank cells, target cells, neighbor heuristics); impossible moves
+        have target -1 and heuristic set to a value larger than any real one.
+        Each neighbor only moves one tile, so its heuristic is the board's plus
+        that tile's change in distance.
+        """
+        distance, moves = self.batch_tables()
+        if heuristics is None:
+            heuristics = self.batch_heuristic(boards)
+        rows = np.arange(boards.shape[0])
+        blanks = np.argmin(boards, axis=1)  # The blank (0) is the smallest tile
+        targets = moves[blanks]
+        valid = targets >= 0
+        tiles = boards[rows[:, None], np.where(valid, targets, blanks[:, None])]
+        neighbor_heuristics = (heuristics[:, None] + distance[tiles, blanks[:, None]]
+                               - distance[tiles, np.where(valid, targets, 0)])
+        neighbor_heuristics = np.where(valid, neighbor_heuristics, np.iinfo(np.int64).max)
+        return blanks, targets, neighbor_heuristics
+
+    def batch_steepest_ascent(self, boards, max_steps=None):
+        """
+        Steepest Ascent Hill Climbing for many independent climbers in lockstep.
+        `boards` is a 2-D array (one flat board per row, e.g. from boards_to_array);
+        every step scores all neighbors of all climbers in one vectorized pass and
+        moves each climber that can still improve. Returns (final boards, heuristics).
+        """
+        boards = np.array(boards, dtype=np.int64, copy=True)
+        heuristics = self.batch_heuristic(boards)
+        active = np.ones(boards.shape[0], dtype=bool)
+        steps = 0
+        while active.any() and (max_steps is None or steps < max_steps):
+            index = np.flatnonzero(active)
+            blanks, targets, neighbor_heuristics = self.batch_neighbors(boards[index], heuristics[index])
+            best = np.argmin(neighbor_heuristics, axis=1)
+            best_heuristics = neighbor_heuristics[np.arange(index.size), best]
+
+            # Climbers without a better neighbor have reached their local optimum
+            improving = best_heuristics < heuristics[index]
+            active[index[~improving]] = False
+            index, blanks = index[improving], blanks[improving]
+            best_targets = targets[improving, best[improving]]
+
+            # Slide the chosen tile into the blank cell
+            boards[index, blanks] = boards[index, best_targets]
+            boards[index, best_targets] = 0
+            heuristics[index] = best_heuristics[improving]
+            steps += 1
+        return boards, heuristics
+
     def print_state(self, state):
         """
         Print the current state of the puzzle in a readable format.
@@ -87,6 +269,110 @@ class Puzzle:
         print()
 
 
+# Set in each worker process by parallel_hill_climb, so any climb can see that one has succeeded
+_stop_event = None
+
+
+def _init_worker(event):
+    global _stop_event
+    _stop_event = event
+
+
+def _run_climb(task):
+    """
+    Run one hill-climbing restart in a worker process.
+    Returns (final state, heuristic, evaluations, seconds, abandoned); the state and
+    heuristic are None for a run skipped because another had already reached the goal.
+    """
+    initial_state, goal_state, pattern_db, variant, run, seed, options = task
+    if _stop_event.is_set():
+        return None, None, 0, 0.0, True
+
+    started = time.perf_counter()
+    rng = random.Random(seed * 1000003 + run)
+    puzzle = Puzzle(initial_state, goal_state, pattern_db)
+    # The first run starts from the initial state, the others from a random walk away from it
+    start = initial_state if run == 0 else puzzle.scramble(options.get("scramble_moves", 20), rng)
+    stopped = False  # Set once the stop check has ended the climb
+
+    def stop():
+        nonlocal stopped
+        stopped = _stop_event.is_set()
+        return stopped
+
+    if variant == "random-restart":
+        state, heuristic = puzzle.steepest_ascent(start, stop=stop)
+    elif variant == "sideways":
+        state, heuristic = puzzle.sideways_ascent(start, options.get("max_sideways", 100), rng, stop=stop)
+    elif variant == "first-choice":
+        state, heuristic = puzzle.first_choice(start, options.get("max_steps", 1000), rng, stop=stop)
+    else:
+        raise ValueError(f"Unknown hill-climbing variant: {variant}")
+
+    abandoned = stopped and heuristic != 0
+    if heuristic == 0:
+        _stop_event.set()  # Tell every other worker to stop
+    return state, heuristic, puzzle.evaluations, time.perf_counter() - started, abandoned
+
+
+def parallel_hill_climb(puzzle, variant="random-restart", restarts=100, workers=None, seed=0, **options):
+    """
+    Run many hill-climbing restarts of a puzzle across a process pool.
+
+    Parameters:
+    - variant: "random-restart" (steepest ascent), "sideways" (steepest ascent with up to
+      max_sideways plateau moves) or "first-choice" (stochastic first-choice, max_steps).
+    - restarts: Number of runs; run 0 starts from the initial state, the others from
+      a random walk of scramble_moves slides away from it.
+    - workers: Number of processes (default: one per CPU core).
+    - seed: Makes the runs reproducible.
+
+    All workers stop as soon as one run reaches the goal: runs still climbing are
+    abandoned and runs not yet started are skipped. Returns a dict with the best state
+    and heuristic, the number of runs that climbed (completed or abandoned, each also
+    counted on its own) and the success rate over them, the evaluations per second
+    and the time to the first solution (None if none). Both times are measured from
+    when the pool is up, so process startup is not counted.
+    """
+    event = multiprocessing.Event()
+    tasks = [(puzzle.initial_state, puzzle.goal_state, puzzle.pattern_db, variant, run, seed, options)
+             for run in range(restarts)]
+
+    completed = abandoned_runs = solved = evaluations = 0
+    time_to_first_solution = None
+    best_state, best_heuristic = puzzle.initial_state, float("inf")
+    with multiprocessing.Pool(workers, initializer=_init_worker, initargs=(event,)) as pool:
+        started = time.perf_counter()
+        for state, heuristic, run_evaluations, _, abandoned in pool.imap_unordered(_run_climb, tasks):
+            evaluations += run_evaluations
+            if heuristic is None:
+                continue  # Skipped without climbing
+            if abandoned:
+                abandoned_runs += 1
+            else:
+                completed += 1
+            if heuristic < best_heuristic:
+                best_state, best_heuristic = state, heuristic
+            if heuristic == 0:
+                solved += 1
+                if time_to_first_solution is None:
+                    time_to_first_solution = time.perf_counter() - started
+    elapsed = time.perf_counter() - started
+
+    return {
+        "best_state": best_state,
+        "best_heuristic": best_heuristic,
+        "runs": completed + abandoned_runs,
+        "completed": completed,
+        "abandoned": abandoned_runs,
+        "solved": solved,
+        "success_rate": solved / (completed + abandoned_runs) if completed + abandoned_runs else 0.0,
+        "evaluations": evaluations,
+        "evaluations_per_second": evaluations / elapsed if elapsed > 0 else 0.0,
+        "time_to_first_solution": time_to_first_solution,
+    }
+
+
 # Driver Code
 if __name__ == "__main__":
     # Initial state of the puzzle
@@ -122,3 +408,20 @@ if __name__ == "__main__":
         print("Goal state reached!")
     else:
         print("Local optimum reached. Heuristic:", final_heuristic)
+
+    # Parallel restarts of the stochastic variants, from a board far enough from the
+    # goal that a single climb usually gets stuck
+    scrambled = Puzzle(puzzle.scramble(30, random.Random(1)), goal_state_flat)
+    for variant in ["random-restart", "sideways", "first-choice"]:
+        report = parallel_hill_climb(scrambled, variant=variant, restarts=200)
+        first = report["time_to_first_solution"]
+        print(f"{variant}: success rate {report['success_rate']:.2f} over {report['runs']} runs "
+              f"({report['completed']} completed, {report['abandoned']} abandoned), "
+              f"{report['evaluations_per_second']:.0f} evaluations/s, "
+              + ("no solution" if first is None else f"first solution after {first:.3f} s"))
+
+    # Vectorized hill climbing for a batch of scrambled boards
+    if np is not None:
+        starts = puzzle.boards_to_array([puzzle.scramble(20) for _ in range(1000)])
+        finals, heuristics = puzzle.batch_steepest_ascent(starts)
+        print(f"Batch of {len(starts)} climbers: {(heuristics == 0).mean():.2%} reached the goal")
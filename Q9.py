@@ -1,7 +1,147 @@
 import math
+import multiprocessing
 import random
 
-def simulated_annealing(initial_state, objective_function, neighbor_function, temperature_schedule):
+try:
+    import numpy as np
+except ImportError:  # NumPy is only needed by batch_simulated_annealing
+    np = None
+
+import observers
+from observers import NullObserver
+
+
+class RingBufferRecorder(observers.RingBufferRecorder):
+    """
+    Observer of simulated_annealing that keeps the last `capacity` iterations of a run
+    (times, temperatures, values, deltas, accepted), overwriting the oldest.
+    """
+
+    def __init__(self, capacity=10000):
+        super().__init__([("times", "q"), ("temperatures", "d"), ("values", "d"), ("deltas", "d"),
+                          ("accepted", "?")], capacity)
+
+    def acceptance_rate(self):
+        """
+        Fraction of the kept iterations whose move was accepted.
+        """
+        return sum(self.accepted[:len(self)]) / len(self) if len(self) else 0.0
+
+
+class SampledLogger(observers.SampledLogger):
+    """
+    Observer of simulated_annealing that prints one iteration out of every `every`.
+    """
+
+    def message(self, time, temperature, value, delta, accepted):
+        return f"Time: {time}, Temperature: {temperature:.2f}, Current Value: {value}, Delta: {delta}"
+
+
+class Schedule:
+    """
+    Base class of the stateful temperature schedules. A schedule is called like
+    temperature_schedule (time -> temperature); simulated_annealing also calls
+    update(accepted, delta) after every move and reheat() on stagnation. Subclasses
+    override cool (the next temperature from the current one) or update; the base
+    schedule itself keeps the temperature constant.
+    - initial_temperature: Starting temperature (see estimate_initial_temperature).
+    - reheat_ratio: reheat() raises the temperature to this fraction of the initial one.
+    """
+
+    def __init__(self, initial_temperature, reheat_ratio=0.1):
+        self.initial_temperature = initial_temperature
+        self.temperature = initial_temperature
+        self.reheat_ratio = reheat_ratio
+
+    def __call__(self, time):
+        return self.temperature
+
+    def update(self, accepted, delta):
+        self.temperature = self.cool(self.temperature)
+
+    def cool(self, temperature):
+        return temperature
+
+    def reheat(self):
+        self.temperature = max(self.temperature, self.initial_temperature * self.reheat_ratio)
+
+
+class GeometricSchedule(Schedule):
+    """
+    T(k+1) = alpha * T(k).
+    """
+
+    def __init__(self, initial_temperature, alpha=0.999, reheat_ratio=0.1):
+        super().__init__(initial_temperature, reheat_ratio)
+        self.alpha = alpha
+
+    def cool(self, temperature):
+        return self.alpha * temperature
+
+
+class LundyMeesSchedule(Schedule):
+    """
+    Lundy-Mees schedule: T(k+1) = T(k) / (1 + beta * T(k)).
+    """
+
+    def __init__(self, initial_temperature, beta=1e-3, reheat_ratio=0.1):
+        super().__init__(initial_temperature, reheat_ratio)
+        self.beta = beta
+
+    def cool(self, temperature):
+        return temperature / (1 + self.beta * temperature)
+
+
+class AdaptiveSchedule(Schedule):
+    """
+    Acceptance-rate targeting: every `window` moves the temperature is scaled by
+    exp(gain * (target - measured acceptance rate)), so it rises when too few moves
+    are accepted and falls when too many are. The target itself decays geometrically
+    from start_acceptance to final_acceptance, which is what makes the search anneal.
+    """
+
+    def __init__(self, initial_temperature, start_acceptance=0.5, final_acceptance=0.01,
+                 target_decay=0.97, window=100, gain=2.0, reheat_ratio=0.1):
+        super().__init__(initial_temperature, reheat_ratio)
+        self.target = start_acceptance
+        self.final_acceptance = final_acceptance
+        self.target_decay = target_decay
+        self.window = window
+        self.gain = gain
+        self.moves = self.accepted = 0
+
+    def update(self, accepted, delta):
+        self.moves += 1
+        self.accepted += accepted
+        if self.moves == self.window:
+            rate = self.accepted / self.window
+            self.temperature *= math.exp(self.gain * (self.target - rate))
+            self.target = max(self.final_acceptance, self.target * self.target_decay)
+            self.moves = self.accepted = 0
+
+
+def estimate_initial_temperature(initial_state, objective_function, neighbor_function,
+                                 acceptance=0.8, samples=100):
+    """
+    Pick a starting temperature at which a typical worsening move is accepted with
+    probability `acceptance`: T0 = -mean(|worsening delta|) / ln(acceptance), with the
+    deltas sampled along a random walk of `samples` neighbor moves.
+    """
+    state, value = initial_state, objective_function(initial_state)
+    worse = []
+    for _ in range(samples):
+        neighbor = neighbor_function(state)
+        neighbor_value = objective_function(neighbor)
+        if neighbor_value < value:
+            worse.append(value - neighbor_value)
+        state, value = neighbor, neighbor_value
+    if not worse:
+        return 1.0
+    return -(sum(worse) / len(worse)) / math.log(acceptance)
+
+
+def simulated_annealing(initial_state, objective_function, neighbor_function, temperature_schedule,
+                        max_iterations=1000, observer=None, target=None, reheat_after=None):
     """
     Perform simulated annealing to demonstrate the effect of temperature on selecting inferior nodes.
 
@@ -10,14 +150,23 @@ def simulated_annealing(initial_state, objective_function, neighbor_function, te
     - objective_function: Function to calculate the "quality" of a state.
     - neighbor_function: Function to generate a neighboring state.
     - temperature_schedule: Function to define the temperature at a given time step.
+    - max_iterations: Iteration budget (time steps run from 1 to max_iterations - 1).
+    - observer: Gets record(time, temperature, value, delta, accepted) after every
+      iteration (NullObserver, RingBufferRecorder, SampledLogger or your own).
+    - target: Stop as soon as the current value reaches this value.
+    - reheat_after: Call temperature_schedule.reheat() after this many iterations
+      without a new best value (needs a Schedule).
 
     Returns:
     - final_state: The state after the simulated annealing process.
     """
     current_state = initial_state
     current_value = objective_function(current_state)
+    record = (NullObserver() if observer is None else observer).record
+    update = getattr(temperature_schedule, "update", None)
+    best_value, since_improvement = current_value, 0
 
-    for time in range(1, 1000):  # Max number of iterations
+    for time in range(1, max_iterations):  # Max number of iterations
         temperature = temperature_schedule(time)
         if temperature <= 0:
             break  # Stop if temperature becomes too low
@@ -30,16 +179,172 @@ def simulated_annealing(initial_state, objective_function, neighbor_function, te
         delta_value = neighbor_value - current_value
 
         # Decide whether to move to the neighbor
-        if delta_value > 0 or random.random() < math.exp(delta_value / temperature):
+        accepted = delta_value > 0 or random.random() < math.exp(delta_value / temperature)
+        if accepted:
             # Accept the move (even if inferior, based on probability)
             current_state = neighbor
             current_value = neighbor_value
 
-        print(f"Time: {time}, Temperature: {temperature:.2f}, Current Value: {current_value}, Delta: {delta_value}")
+        record(time, temperature, current_value, delta_value, accepted)
+        if update is not None:
+            update(accepted, delta_value)
+
+        if target is not None and current_value >= target:
+            break
+        if current_value > best_value:
+            best_value, since_improvement = current_value, 0
+        else:
+            since_improvement += 1
+            if reheat_after is not None and since_improvement >= reheat_after:
+                temperature_schedule.reheat()
+                since_improvement = 0
 
     return current_state
 
 
+def batch_simulated_annealing(initial_states, objective_function, neighbor_function, temperature_schedule,
+                              max_iterations=1000, rng=None, patience=None, target=None):
+    """
+    Run K independent annealing chains in lockstep on NumPy arrays.
+
+    Parameters:
+    - initial_states: Array of K starting states (one per chain, along the first axis).
+    - objective_function: Vectorized objective: array of states -> array of K values.
+    - neighbor_function: Vectorized neighbor: (array of states, rng) -> array of neighbors.
+    - temperature_schedule: Function to define the temperature at a given time step.
+    - max_iterations: Iteration budget (time steps run from 1 to max_iterations - 1).
+    - rng: NumPy Generator (or seed) shared by every chain.
+    - patience: Stop after this many iterations without a new best value.
+    - target: Stop as soon as any chain reaches this value.
+
+    Returns:
+    - (best_state, best_value): The best state seen by any chain and its value.
+    """
+    if np is None:
+        raise ImportError("batch_simulated_annealing requires NumPy")
+    rng = np.random.default_rng(rng)
+
+    current_states = np.array(initial_states, dtype=float)
+    current_values = objective_function(current_states)
+    best = int(np.argmax(current_values))
+    best_state, best_value = current_states[best].copy(), current_values[best]
+    since_improvement = 0
+
+    for time in range(1, max_iterations):
+        temperature = temperature_schedule(time)
+        if temperature <= 0:
+            break  # Stop if temperature becomes too low
+
+        # Propose one neighbor per chain and evaluate them all at once
+        neighbors = neighbor_function(current_states, rng)
+        neighbor_values = objective_function(neighbors)
+        delta_values = neighbor_values - current_values
+
+        # Metropolis test for every chain (exp is capped at 1 for improving moves)
+        accept = rng.random(delta_values.shape) < np.exp(np.minimum(delta_values / temperature, 0.0))
+        current_states = np.where(accept.reshape(accept.shape + (1,) * (current_states.ndim - 1)),
+                                  neighbors, current_states)
+        current_values = np.where(accept, neighbor_values, current_values)
+
+        leader = int(np.argmax(current_values))
+        if current_values[leader] > best_value:
+            best_state, best_value = current_states[leader].copy(), current_values[leader]
+            since_improvement = 0
+        else:
+            since_improvement += 1
+        if target is not None and best_value >= target:
+            break
+        if patience is not None and since_improvement >= patience:
+            break
+
+    return best_state, best_value
+
+
+def _tempering_segment(task):
+    """
+    Worker side of parallel_tempering: run one replica for `steps` Metropolis steps
+    at its fixed temperature. The replica's random state is installed before the
+    segment and handed back after it, so the result does not depend on which
+    process ran it.
+    """
+    state, value, temperature, steps, random_state, objective_function, neighbor_function = task
+    random.setstate(random_state)
+    best_state, best_value = state, value
+    for _ in range(steps):
+        neighbor = neighbor_function(state)
+        neighbor_value = objective_function(neighbor)
+        delta_value = neighbor_value - value
+        if delta_value > 0 or random.random() < math.exp(delta_value / temperature):
+            state, value = neighbor, neighbor_value
+            if value > best_value:
+                best_state, best_value = state, value
+    return state, value, best_state, best_value, random.getstate()
+
+
+def parallel_tempering(initial_state, objective_function, neighbor_function, temperatures,
+                       rounds=100, swap_interval=10, workers=None, seed=0):
+    """
+    Replica-exchange annealing: one replica of the search per temperature, each run
+    in a worker process, with swaps between adjacent temperatures after every round.
+
+    Parameters:
+    - initial_state: The starting state of every replica.
+    - objective_function: Function to calculate the "quality" of a state (picklable).
+    - neighbor_function: Function to generate a neighboring state (picklable; it may
+      draw from the random module, which is seeded per replica).
+    - temperatures: Temperature ladder, one replica per entry (sorted ascending).
+    - rounds: Number of run-then-swap rounds.
+    - swap_interval: Metropolis steps each replica runs per round.
+    - workers: Number of processes (default: one per CPU core).
+    - seed: Replica i draws from random.Random(seed + i + 1) and the swap decisions
+      from random.Random(seed), so a run is reproducible for any number of workers.
+
+    Adjacent replicas i and j = i + 1 swap states with probability
+    min(1, exp((v_j - v_i) * (1/T_i - 1/T_j))).
+
+    Returns a dict with the best state and value seen by any replica, the final
+    state and value at each temperature, the swap acceptance rate and the
+    number of objective evaluations.
+    """
+    temperatures = sorted(temperatures)
+    swap_rng = random.Random(seed)
+    random_states = [random.Random(seed + i + 1).getstate() for i in range(len(temperatures))]
+    initial_value = objective_function(initial_state)
+    states = [initial_state] * len(temperatures)
+    values = [initial_value] * len(temperatures)
+    best_state, best_value = initial_state, initial_value
+    swaps_attempted = swaps_accepted = 0
+
+    with multiprocessing.Pool(workers) as pool:
+        for round_index in range(rounds):
+            tasks = [(states[i], values[i], temperatures[i], swap_interval, random_states[i],
+                      objective_function, neighbor_function) for i in range(len(temperatures))]
+            for i, (state, value, replica_best, replica_best_value, random_state) in enumerate(
+                    pool.map(_tempering_segment, tasks)):
+                states[i], values[i], random_states[i] = state, value, random_state
+                if replica_best_value > best_value:
+                    best_state, best_value = replica_best, replica_best_value
+
+            # Alternate between even and odd pairs so every pair is tried every two rounds
+            for i in range(round_index % 2, len(temperatures) - 1, 2):
+                j = i + 1
+                swaps_attempted += 1
+                exponent = (values[j] - values[i]) * (1 / temperatures[i] - 1 / temperatures[j])
+                if exponent >= 0 or swap_rng.random() < math.exp(exponent):
+                    states[i], states[j] = states[j], states[i]
+                    values[i], values[j] = values[j], values[i]
+                    swaps_accepted += 1
+
+    return {
+        "best_state": best_state,
+        "best_value": best_value,
+        "states": states,
+        "values": values,
+        "swap_rate": swaps_accepted / swaps_attempted if swaps_attempted else 0.0,
+        "evaluations": 1 + rounds * swap_interval * len(temperatures),
+    }
+
+
 def objective_function(state):
     """
     Example objective function: Maximize a simple quadratic function.
@@ -55,6 +360,82 @@ def neighbor_function(state):
     return state + random.uniform(-1, 1)
 
 
+def batch_neighbor_function(states, rng):
+    """
+    Vectorized neighbor_function: a small random move for every chain.
+    """
+    return states + rng.uniform(-1, 1, size=states.shape)
+
+
+def rastrigin(state):
+    """
+    Negated Rastrigin function of a list of coordinates (maximum 0 at the origin,
+    with a local maximum at every integer point).
+    """
+    return -(10 * len(state) + sum(x * x - 10 * math.cos(2 * math.pi * x) for x in state))
+
+
+def ackley(state):
+    """
+    Negated Ackley function of a list of coordinates (maximum 0 at the origin).
+    """
+    n = len(state)
+    square_mean = sum(x * x for x in state) / n
+    cosine_mean = sum(math.cos(2 * math.pi * x) for x in state) / n
+    return -(-20 * math.exp(-0.2 * math.sqrt(square_mean)) - math.exp(cosine_mean) + 20 + math.e)
+
+
+def vector_neighbor_function(state):
+    """
+    Generate a neighbor of a list of coordinates by moving one coordinate a little.
+    """
+    neighbor = list(state)
+    neighbor[random.randrange(len(neighbor))] += random.uniform(-1, 1)
+    return neighbor
+
+
+def benchmark_schedules(runs=20, max_iterations=20000, seed=0):
+    """
+    Compare schedules by evaluations to target quality on the quadratic objective,
+    Rastrigin and Ackley (2-D). Every run starts from a random state, estimates its
+    initial temperature and stops at the target. Returns {(problem, schedule):
+    (success rate, mean evaluations of the successful runs)}.
+    """
+    problems = [
+        ("quadratic", objective_function, neighbor_function, lambda: random.uniform(0, 10), 9.999),
+        ("rastrigin", rastrigin, vector_neighbor_function, lambda: [random.uniform(-5, 5) for _ in range(2)], -0.1),
+        ("ackley", ackley, vector_neighbor_function, lambda: [random.uniform(-5, 5) for _ in range(2)], -0.1),
+    ]
+    final_ratio = 1e-4  # Geometric and Lundy-Mees end at T0 * final_ratio
+    schedules = [
+        ("100/(1+t)", lambda t0: temperature_schedule, None),
+        ("geometric", lambda t0: GeometricSchedule(t0, alpha=final_ratio ** (1 / max_iterations)), None),
+        ("lundy-mees", lambda t0: LundyMeesSchedule(t0, beta=(1 / final_ratio - 1) / (max_iterations * t0)), None),
+        ("adaptive", lambda t0: AdaptiveSchedule(t0), None),
+        ("geometric+reheat", lambda t0: GeometricSchedule(t0, alpha=final_ratio ** (1 / max_iterations)),
+         max_iterations // 5),
+    ]
+
+    results = {}
+    for problem, objective, neighbor, start, target_value in problems:
+        for name, make_schedule, reheat_after in schedules:
+            random.seed(seed)
+            evaluations = []
+            for _ in range(runs):
+                initial_state = start()
+                initial_temperature = estimate_initial_temperature(initial_state, objective, neighbor)
+                recorder = RingBufferRecorder(1)
+                final_state = simulated_annealing(initial_state, objective, neighbor,
+                                                  make_schedule(initial_temperature), max_iterations,
+                                                  observer=recorder, target=target_value,
+                                                  reheat_after=reheat_after)
+                if objective(final_state) >= target_value:
+                    evaluations.append(recorder.count + 1)
+            mean = sum(evaluations) / len(evaluations) if evaluations else None
+            results[problem, name] = (len(evaluations) / runs, mean)
+    return results
+
+
 def temperature_schedule(time):
     """
     Temperature schedule: Decreases over time.
@@ -74,8 +455,35 @@ if __name__ == "__main__":
         initial_state=initial_state,
         objective_function=objective_function,
         neighbor_function=neighbor_function,
-        temperature_schedule=temperature_schedule
+        temperature_schedule=temperature_schedule,
+        observer=SampledLogger(every=100)
     )
 
     print(f"\nFinal State: {final_state}")
     print(f"Final Value: {objective_function(final_state)}")
+
+    # Run many chains at once and keep the best
+    if np is not None:
+        best_state, best_value = batch_simulated_annealing(
+            initial_states=np.random.default_rng().uniform(0, 10, size=1000),
+            objective_function=objective_function,
+            neighbor_function=batch_neighbor_function,
+            temperature_schedule=temperature_schedule
+        )
+        print(f"\nBest of 1000 chains: State {best_state}, Value {best_value}")
+
+    # Replica exchange over a geometric temperature ladder from 0.1 to 100
+    result = parallel_tempering(
+        initial_state=initial_state,
+        objective_function=objective_function,
+        neighbor_function=neighbor_function,
+        temperatures=[0.1 * 1000 ** (i / 7) for i in range(8)]
+    )
+    print(f"\nParallel tempering: State {result['best_state']}, Value {result['best_value']}, "
+          f"swap rate {result['swap_rate']:.2f}")
+
+    # Evaluations to target quality for each schedule
+    print("\nSchedule benchmark (success rate, mean evaluations to target):")
+    for (problem, schedule), (success_rate, mean) in benchmark_schedules(runs=10, max_iterations=5000).items():
+        mean_text = f"{mean:.0f}" if mean is not None else "-"
+        print(f"{problem:10} {schedule:17} {success_rate:5.0%} {mean_text:>6}")
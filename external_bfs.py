@@ -0,0 +1,177 @@
+import heapq
+import os
+import tempfile
+import time
+
+
+def read_records(path, record_size, buffer_records=4096):
+    """
+    Stream the fixed-size records of a file in order.
+    """
+    with open(path, "rb") as handle:
+        while True:
+            block = handle.read(record_size * buffer_records)
+            if not block:
+                return
+            for offset in range(0, len(block), record_size):
+                yield block[offset:offset + record_size]
+
+
+def write_run(path, records):
+    """
+    Sort a chunk of records in memory and write it as one sorted run.
+    """
+    records.sort()
+    with open(path, "wb") as handle:
+        handle.write(b"".join(records))
+
+
+def merge_runs(run_paths, output_path, record_size, buffer_records=4096):
+    """
+    Merge sorted runs into one sorted run without duplicates. Returns the number written.
+    """
+    runs = heapq.merge(*(read_records(path, record_size, buffer_records) for path in run_paths))
+    written = 0
+    last = None
+    with open(output_path, "wb") as handle:
+        for record in runs:
+            if record != last:
+                handle.write(record)
+                written += 1
+                last = record
+    return written
+
+
+def reduce_runs(run_paths, record_size, fan_in=64, buffer_records=4096):
+    """
+    Merge groups of at most fan_in runs into longer runs, pass after pass, until no
+    more than fan_in are left, deleting the merged inputs. No pass opens more than
+    fan_in runs at once, so neither open files nor read buffers grow with the number
+    of runs. Returns the remaining run paths.
+    """
+    if fan_in < 2:
+        raise ValueError("fan_in must be at least 2")
+    merge_pass = 0
+    while len(run_paths) > fan_in:
+        merge_pass += 1
+        merged = []
+        for start in range(0, len(run_paths), fan_in):
+            group = run_paths[start:start + fan_in]
+            if len(group) == 1:
+                merged.append(group[0])
+                continue
+            base = os.path.splitext(group[0])[0]
+            merged.append(f"{base}-m{merge_pass}.bin")
+            merge_runs(group, merged[-1], record_size, buffer_records)
+            for path in group:
+                os.remove(path)
+        run_paths = merged
+    return run_paths
+
+
+def merge_layer(run_paths, previous_paths, output_path, record_size, buffer_records=4096):
+    """
+    Merge sorted runs into one sorted layer file without duplicates, dropping every
+    record that is also in one of the (sorted) previous layer files. All inputs are
+    streamed, so memory holds one read buffer per file (see reduce_runs to bound the
+    number of runs). Returns the number written.
+    """
+    runs = heapq.merge(*(read_records(path, record_size, buffer_records) for path in run_paths))
+    previous = [read_records(path, record_size, buffer_records) for path in previous_paths]
+    heads = [next(records, None) for records in previous]
+
+    written = 0
+    last = None
+    with open(output_path, "wb") as handle:
+        for record in runs:
+            if record == last:
+                continue
+            last = record
+            seen = False
+            for i, records in enumerate(previous):
+                # Advance each previous layer up to the current record (merge join)
+                while heads[i] is not None and heads[i] < record:
+                    heads[i] = next(records, None)
+                if heads[i] == record:
+                    seen = True
+            if not seen:
+                handle.write(record)
+                written += 1
+    return written
+
+
+def external_bfs(start_records, successors, record_size, directory=None, chunk_records=1 << 18, max_layers=None,
+                 fan_in=64, buffer_records=4096):
+    """
+    Breadth-first enumeration of a state space layer by layer on disk.
+    - start_records: States of layer 0, each encoded as a `record_size` byte string.
+    - successors: Function record -> iterable of successor records. Every move must
+      be reversible (an undirected state graph), so a new layer only needs to be
+      deduplicated against the two layers before it.
+    - directory: Where the layer and run files go (default: a temporary directory
+      that is removed afterwards).
+    - chunk_records: Successors buffered in memory before a sorted run is written;
+      with fan_in and buffer_records this bounds memory regardless of the size of the space.
+    - max_layers: Stop after this many layers (default: until a layer is empty).
+    - fan_in: Most runs merged at once; a layer with more runs is merged in several
+      passes, so the files open at once stay at fan_in + 3.
+    - buffer_records: Records read at a time from each open file.
+
+    Each layer is one file of sorted fixed-size records. Returns a dict with the size
+    of each layer, the number of states, the diameter (depth of the last non-empty
+    layer from layer 0) and the elapsed time.
+    """
+    with tempfile.TemporaryDirectory(dir=directory) as work:
+        started = time.perf_counter()
+        layer_paths = [os.path.join(work, "layer-00000.bin")]
+        start = sorted(set(start_records))
+        with open(layer_paths[0], "wb") as handle:
+            handle.write(b"".join(start))
+        layer_sizes = [len(start)]
+
+        while layer_sizes[-1] and (max_layers is None or len(layer_sizes) < max_layers):
+            depth = len(layer_sizes)
+            # Expand the last layer into sorted runs of at most chunk_records records
+            run_paths = []
+            buffer = []
+            for record in read_records(layer_paths[-1], record_size, buffer_records):
+                buffer.extend(successors(record))
+                if len(buffer) >= chunk_records:
+                    run_paths.append(os.path.join(work, f"run-{depth:05d}-{len(run_paths):05d}.bin"))
+                    write_run(run_paths[-1], buffer)
+                    buffer = []
+            if buffer:
+                run_paths.append(os.path.join(work, f"run-{depth:05d}-{len(run_paths):05d}.bin"))
+                write_run(run_paths[-1], buffer)
+
+            run_paths = reduce_runs(run_paths, record_size, fan_in, buffer_records)
+            layer_paths.append(os.path.join(work, f"layer-{depth:05d}.bin"))
+            layer_sizes.append(merge_layer(run_paths, layer_paths[-3:-1], layer_paths[-1], record_size,
+                                           buffer_records))
+
+            # Runs and layers more than two back are no longer needed
+            for path in run_paths:
+                os.remove(path)
+            if len(layer_paths) > 3:
+                os.remove(layer_paths[-4])
+
+        if not layer_sizes[-1]:
+            layer_sizes.pop()
+        return {
+            "layer_sizes": layer_sizes,
+            "states": sum(layer_sizes),
+            "diameter": len(layer_sizes) - 1,
+            "seconds": time.perf_counter() - started,
+        }
+
+
+# Driver Code
+if __name__ == "__main__":
+    from Q7 import Puzzle
+
+    # All 9!/2 states reachable from the 8-puzzle goal, with at most 20000 records in memory
+    goal_state = [[1, 2, 3], [4, 5, 6], [7, 8, 0]]
+    result = Puzzle(goal_state, goal_state).enumerate_layers(chunk_records=20000)
+    print(f"8-puzzle: {result['states']} states, diameter {result['diameter']}, "
+          f"{result['seconds']:.1f} s")
+    print(f"Layer sizes: {result['layer_sizes']}")
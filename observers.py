@@ -0,0 +1,90 @@
+import sys
+from array import array
+
+
+class NullObserver:
+    """
+    Default observer of a run loop: records nothing.
+    """
+
+    def record(self, *values):
+        pass
+
+
+class RingBufferRecorder:
+    """
+    Observer that keeps the last `capacity` records of a run, one preallocated column
+    per field, overwriting the oldest.
+    - fields: (name, typecode) pairs in the order record() receives the values. The
+      typecode is an array module code for a numeric column, "?" for a bool column
+      (a bytearray) or None for a column of arbitrary objects. Each column is also
+      an attribute named after its field.
+    - capacity: Number of records kept.
+    """
+
+    def __init__(self, fields, capacity=10000):
+        self.capacity = capacity
+        self.fields = tuple(name for name, _ in fields)
+        self.columns = []
+        self.flags = []  # Indices of the bool columns
+        for index, (name, typecode) in enumerate(fields):
+            if typecode is None:
+                column = [None] * capacity
+            elif typecode == "?":
+                column = bytearray(capacity)
+                self.flags.append(index)
+            else:
+                column = array(typecode, bytes(array(typecode).itemsize * capacity))
+            self.columns.append(column)
+            setattr(self, name, column)
+        self.count = 0  # Records seen so far, including overwritten ones
+
+    def record(self, *values):
+        slot = self.count % self.capacity
+        for column, value in zip(self.columns, values):
+            column[slot] = value
+        self.count += 1
+
+    def __len__(self):
+        return min(self.count, self.capacity)
+
+    def slots(self):
+        """
+        Slots of the kept records, oldest first.
+        """
+        start = self.count - len(self)
+        return [(start + i) % self.capacity for i in range(len(self))]
+
+    def column(self, name):
+        """
+        Values of one field over the kept records, oldest first.
+        """
+        column = self.columns[self.fields.index(name)]
+        if self.fields.index(name) in self.flags:
+            return [bool(column[slot]) for slot in self.slots()]
+        return [column[slot] for slot in self.slots()]
+
+    def records(self):
+        """
+        Return the kept records, oldest first, as tuples in field order.
+        """
+        return list(zip(*(self.column(name) for name in self.fields)))
+
+
+class SampledLogger:
+    """
+    Observer that prints one record out of every `every` to `stream` (default stdout).
+    The first value of a record is its step counter; subclasses format the line in
+    message().
+    """
+
+    def __init__(self, every=100, stream=None):
+        self.every = every
+        self.stream = stream
+
+    def record(self, step, *values):
+        if step % self.every == 0:
+            print(self.message(step, *values), file=self.stream or sys.stdout)
+
+    def message(self, step, *values):
+        return f"Step: {step}, " + ", ".join(map(str, values))
@@ -0,0 +1,259 @@
+import mmap
+import struct
+import time
+from collections import deque
+
+MAGIC = b"PDB1"
+UNSEEN = 255  # Table entries are single bytes; 255 marks "not reached yet"
+
+# Disjoint tile partitions used when none are given (8-puzzle: 4-4, 15-puzzle: 5-5-5)
+DEFAULT_PARTITIONS = {
+    3: [(1, 2, 3, 4), (5, 6, 7, 8)],
+    4: [(1, 2, 3, 4, 5), (6, 7, 8, 9, 10), (11, 12, 13, 14, 15)],
+}
+
+
+def flatten(state):
+    """
+    Return a board as a flat row-major list, whether it is given flat or as a list of lists.
+    """
+    if state and isinstance(state[0], (list, tuple)):
+        return [val for row in state for val in row]
+    return list(state)
+
+
+class PatternDatabase:
+    def __init__(self, goal_state, partitions, tables):
+        """
+        Initialize an additive pattern database.
+        - goal_state: Goal board (flat or list of lists) the tables were built for.
+        - partitions: Disjoint tuples of tiles; each partition has its own table.
+        - tables: One byte buffer per partition (bytearray, or a memoryview into an mmap).
+        """
+        self.goal_tiles = flatten(goal_state)
+        self.size = len(self.goal_tiles)
+        self.n = int(round(self.size ** 0.5))
+        self.partitions = [tuple(partition) for partition in partitions]
+        self.tables = tables
+        self.build_seconds = None
+        self.path = None  # File the tables are mapped from (see load)
+        self._mmap = None
+
+        # Partition index of each tile (None for the blank and tiles outside every pattern)
+        self.partition_of = [None] * self.size
+        for index, partition in enumerate(self.partitions):
+            for tile in partition:
+                self.partition_of[tile] = index
+
+        # Multipliers for ranking k tile positions out of `size` cells
+        self.multipliers = []
+        for partition in self.partitions:
+            k = len(partition)
+            weights = []
+            for i in range(k):
+                weight = 1
+                for j in range(i + 1, k):
+                    weight *= self.size - j
+                weights.append(weight)
+            self.multipliers.append(weights)
+
+    def rank(self, index, cells):
+        """
+        Rank the positions of the tiles in partition `index` (a k-permutation of cells).
+        """
+        rank = 0
+        weights = self.multipliers[index]
+        for i, cell in enumerate(cells):
+            smaller = 0
+            for j in range(i):
+                if cells[j] < cell:
+                    smaller += 1
+            rank += (cell - smaller) * weights[i]
+        return rank
+
+    def unrank(self, index, rank):
+        """
+        Inverse of rank: rebuild the cell of each tile in partition `index`.
+        """
+        free = list(range(self.size))
+        cells = []
+        for weight in self.multipliers[index]:
+            digit, rank = divmod(rank, weight)
+            cells.append(free.pop(digit))
+        return cells
+
+    def partition_value(self, index, positions):
+        """
+        Table value of partition `index`, given `positions` mapping each tile to its cell.
+        """
+        cells = [positions[tile] for tile in self.partitions[index]]
+        return self.tables[index][self.rank(index, cells)]
+
+    def heuristic(self, tiles):
+        """
+        Sum of the partition tables for a flat board (tile per cell).
+        The partitions are disjoint and only count their own tiles' moves, so the sum is admissible.
+        """
+        positions = [0] * self.size
+        for cell, value in enumerate(tiles):
+            positions[value] = cell
+        return sum(self.partition_value(index, positions) for index in range(len(self.partitions)))
+
+    @classmethod
+    def build(cls, goal_state, partitions=None):
+        """
+        Build the tables by a backward 0-1 BFS from the goal in each abstract space.
+        An abstract state is (cells of the partition tiles, blank cell); moving the blank
+        over a non-pattern tile is free, moving a pattern tile costs 1.
+        """
+        goal_tiles = flatten(goal_state)
+        size = len(goal_tiles)
+        n = int(round(size ** 0.5))
+        if partitions is None:
+            if n not in DEFAULT_PARTITIONS:
+                raise ValueError(f"No default partitions for a {n}x{n} puzzle")
+            partitions = DEFAULT_PARTITIONS[n]
+
+        # Cells the blank can slide to from each cell
+        blank_moves = []
+        for cell in range(size):
+            x, y = divmod(cell, n)
+            blank_moves.append([nx * n + ny for nx, ny in [(x - 1, y), (x + 1, y), (x, y - 1), (x, y + 1)]
+                                if 0 <= nx < n and 0 <= ny < n])
+
+        started = time.perf_counter()
+        database = cls(goal_tiles, partitions, [])
+        goal_blank = goal_tiles.index(0)
+        for index, partition in enumerate(database.partitions):
+            entries = database.multipliers[index][0] * size
+            table = bytearray([UNSEEN]) * entries
+            # Best known cost of each (rank, blank) pair
+            visited = bytearray([UNSEEN]) * (entries * size)
+
+            start = database.rank(index, [goal_tiles.index(tile) for tile in partition])
+            visited[start * size + goal_blank] = 0
+            queue = deque([(start * size + goal_blank, 0)])
+            while queue:
+                code, cost = queue.popleft()
+                if visited[code] < cost:
+                    continue  # Stale entry; a cheaper route was found after it was queued
+                rank, blank = divmod(code, size)
+                if cost < table[rank]:
+                    table[rank] = cost
+                cells = database.unrank(index, rank)
+                for target in blank_moves[blank]:
+                    if target in cells:
+                        # The blank swaps with a pattern tile: one counted move
+                        moved = cells[:]
+                        moved[cells.index(target)] = blank
+                        next_code = database.rank(index, moved) * size + target
+                        if cost + 1 < visited[next_code]:
+                            visited[next_code] = cost + 1
+                            queue.append((next_code, cost + 1))
+                    else:
+                        next_code = rank * size + target
+                        if cost < visited[next_code]:
+                            visited[next_code] = cost
+                            queue.appendleft((next_code, cost))
+            database.tables.append(table)
+
+        database.build_seconds = time.perf_counter() - started
+        return database
+
+    def save(self, path):
+        """
+        Write the database to `path` and return the file size in bytes.
+        Layout: magic, partition count, goal board, then each partition (size, tiles, table bytes).
+        """
+        with open(path, "wb") as handle:
+            handle.write(MAGIC)
+            handle.write(struct.pack("<BB", self.size, len(self.partitions)))
+            handle.write(bytes(self.goal_tiles))
+            for partition in self.partitions:
+                handle.write(struct.pack("<B", len(partition)))
+                handle.write(bytes(partition))
+            for table in self.tables:
+                handle.write(table)
+            return handle.tell()
+
+    @classmethod
+    def load(cls, path):
+        """
+        Load a database saved by `save`, memory-mapping the tables read-only so that
+        several solver processes share the same pages.
+        """
+        with open(path, "rb") as handle:
+            mapped = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        if mapped[:4] != MAGIC:
+            mapped.close()
+            raise ValueError(f"{path} is not a pattern database")
+        size, count = struct.unpack_from("<BB", mapped, 4)
+        offset = 6
+        goal_tiles = list(mapped[offset:offset + size])
+        offset += size
+        partitions = []
+        for _ in range(count):
+            k = mapped[offset]
+            partitions.append(tuple(mapped[offset + 1:offset + 1 + k]))
+            offset += 1 + k
+
+        database = cls(goal_tiles, partitions, [])
+        view = memoryview(mapped)
+        for weights in database.multipliers:
+            entries = weights[0] * size
+            database.tables.append(view[offset:offset + entries])
+            offset += entries
+        database.path = path
+        database._mmap = mapped
+        return database
+
+    def __reduce__(self):
+        """
+        Pickle a loaded database as its file, so a process that unpickles it (a solver
+        worker) maps the same pages instead of receiving a copy of the tables.
+        """
+        if self._mmap is not None:
+            return type(self).load, (self.path,)
+        return type(self), (self.goal_tiles, self.partitions, [bytearray(table) for table in self.tables])
+
+    def close(self):
+        """
+        Release the memory map of a loaded database.
+        """
+        if self._mmap is not None:
+            for table in self.tables:
+                table.release()
+            self.tables = []
+            self._mmap.close()
+            self._mmap = None
+
+
+# Driver Code
+if __name__ == "__main__":
+    import os
+    import random
+    import tempfile
+
+    goal_state = [1, 2, 3, 4, 5, 6, 7, 8, 0]
+
+    # Build the 4-4 additive database for the 8-puzzle
+    database = PatternDatabase.build(goal_state)
+    print(f"Build time: {database.build_seconds:.3f} s")
+
+    path = os.path.join(tempfile.gettempdir(), "8puzzle.pdb")
+    file_size = database.save(path)
+    print(f"File size: {file_size} bytes ({path})")
+
+    # Reload through mmap and time lookups on random boards
+    loaded = PatternDatabase.load(path)
+    boards = []
+    for _ in range(10000):
+        board = goal_state[:]
+        random.shuffle(board)
+        boards.append(board)
+    started = time.perf_counter()
+    for board in boards:
+        loaded.heuristic(board)
+    elapsed = time.perf_counter() - started
+    print(f"Lookup cost: {elapsed / len(boards) * 1e6:.2f} us per board")
+    loaded.close()
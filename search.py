@@ -0,0 +1,380 @@
+import heapq
+from array import array
+from collections import deque
+from itertools import count
+
+# (g weight, h weight) of the priority f = g_weight * g + h_weight * h of each best-first method
+BEST_FIRST = {
+    "UCS": (1, 0),
+    "A*": (1, 1),
+    "Weighted A*": (1, None),  # h weight given by graph_search's `weight`
+    "Greedy": (0, 1),
+}
+
+
+class Problem:
+    def __init__(self, initial, successors, is_goal, key=None, heuristic=None, step_cost=None, expand=None):
+        """
+        A search problem for graph_search and ida_search.
+        - initial: The start state.
+        - successors: Function state -> iterable of successor states (None: taken from
+          expand, called with the state's heuristic).
+        - is_goal: Function state -> True at a goal.
+        - key: Function state -> hashable closed-list key (default: the state itself).
+        - heuristic: Function state -> cost estimate (default: 0).
+        - step_cost: Function (state, successor) -> cost of the move (default: 1).
+        - expand: Function (state, h) -> iterable of (successor, step cost, successor h),
+          for problems that update their heuristic per move instead of recomputing it
+          (default: built from successors and step_cost, with h None so the search only
+          computes the heuristic of successors it keeps).
+        """
+        self.initial = initial
+        self.successors = successors
+        self.is_goal = is_goal
+        self.key = key if key is not None else _identity
+        self.heuristic = heuristic if heuristic is not None else _zero
+        self.step_cost = step_cost
+        if expand is not None:
+            self.expand = expand
+
+    def expand(self, state, h_cost):
+        """
+        Successors of `state` with their step costs (the heuristic is left to the search).
+        """
+        step_cost = self.step_cost
+        if step_cost is None:
+            return [(successor, 1, None) for successor in self.successors(state)]
+        return [(successor, step_cost(state, successor), None) for successor in self.successors(state)]
+
+
+def _identity(state):
+    return state
+
+
+def _zero(state):
+    return 0
+
+
+class FIFOFrontier:
+    """
+    Queue frontier (BFS); priorities are ignored.
+    """
+
+    def __init__(self):
+        self.items = deque()
+
+    def push(self, priority, item, depth=0):
+        self.items.append(item)
+
+    def pop(self):
+        return self.items.popleft()
+
+    def __len__(self):
+        return len(self.items)
+
+
+class LIFOFrontier:
+    """
+    Stack frontier (DFS); priorities are ignored.
+    """
+
+    def __init__(self):
+        self.items = []
+
+    def push(self, priority, item, depth=0):
+        self.items.append(item)
+
+    def pop(self):
+        return self.items.pop()
+
+    def __len__(self):
+        return len(self.items)
+
+
+class HeapFrontier:
+    """
+    Binary heap on (priority, insertion count, item): ties are broken by insertion
+    order, so the items themselves are never compared.
+    """
+
+    def __init__(self):
+        self.heap = []
+        self.counter = count()
+
+    def push(self, priority, item, depth=0):
+        heapq.heappush(self.heap, (priority, next(self.counter), item))
+
+    def pop(self):
+        return heapq.heappop(self.heap)[2]
+
+    def __len__(self):
+        return len(self.heap)
+
+
+class BucketFrontier:
+    """
+    Bucket queue for small non-negative integer priorities (A* f-values): one bucket
+    per priority, split into one list per depth (g), plus the lowest possibly
+    non-empty priority, so push and pop are O(1) amortized. Among items of equal
+    priority the deepest comes out first (for A*, the one closest to a goal), last
+    in, first out within a depth. Stale items are not removed; graph_search skips
+    them when they are popped.
+    """
+
+    def __init__(self):
+        self.buckets = []  # buckets[priority][depth] is a list of items
+        self.sizes = []  # Number of items in each priority bucket
+        self.minimum = 0
+        self.count = 0
+
+    def push(self, priority, item, depth=0):
+        buckets = self.buckets
+        while len(buckets) <= priority:
+            buckets.append([])
+            self.sizes.append(0)
+        levels = buckets[priority]
+        while len(levels) <= depth:
+            levels.append([])
+        levels[depth].append(item)
+        self.sizes[priority] += 1
+        self.count += 1
+        if priority < self.minimum:
+            self.minimum = priority
+
+    def pop(self):
+        sizes = self.sizes
+        while not sizes[self.minimum]:
+            self.minimum += 1
+        levels = self.buckets[self.minimum]
+        while not levels[-1]:  # Drop exhausted depths from the top of the bucket
+            levels.pop()
+        sizes[self.minimum] -= 1
+        self.count -= 1
+        return levels[-1].pop()
+
+    def __len__(self):
+        return self.count
+
+
+FRONTIERS = {
+    "BFS": FIFOFrontier,
+    "DFS": LIFOFrontier,
+}
+
+UNVISITED = -2
+NO_PARENT = -1
+
+
+class ArrayClosed:
+    """
+    Closed list for problems whose keys are dense ints in range(size): the parent key
+    of each visited key is kept in one int array, and states are rebuilt from keys by
+    `state_of` when the path is reconstructed. Supports the dict operations used by
+    graph_search (key -> (state, parent key)).
+    """
+
+    def __init__(self, size, state_of):
+        self.parents = array("q", [UNVISITED]) * size
+        self.state_of = state_of
+        self.count = 0
+
+    def __contains__(self, key):
+        return self.parents[key] != UNVISITED
+
+    def __setitem__(self, key, value):
+        parent = value[1]
+        if self.parents[key] == UNVISITED:
+            self.count += 1
+        self.parents[key] = NO_PARENT if parent is None else parent
+
+    def __getitem__(self, key):
+        parent = self.parents[key]
+        if parent == UNVISITED:
+            raise KeyError(key)
+        return self.state_of(key), (None if parent == NO_PARENT else parent)
+
+    def __len__(self):
+        return self.count
+
+
+def reconstruct_path(closed, key):
+    """
+    Follow parent keys back from `key`; the closed list maps each key to (state, parent key).
+    """
+    path = []
+    while key is not None:
+        state, key = closed[key]
+        path.append(state)
+    return path[::-1]
+
+
+def graph_search(problem, method="BFS", frontier=None, closed=None, weight=2.0):
+    """
+    Search `problem` and return the path of states from its initial state to a goal,
+    or None.
+    - method: "BFS", "DFS", "UCS", "A*", "Weighted A*" (f = g + weight * h), "Greedy"
+      or "IDA*" (see ida_search).
+    - frontier: Frontier object with push(priority, item, depth) and pop() (default:
+      FIFO for BFS, LIFO for DFS, a binary heap otherwise; a BucketFrontier suits
+      small integer f-values).
+    - closed: Closed-list backend mapping key -> (state, parent key) (default: a
+      dict; see ArrayClosed). After the search its length is the number of states stored.
+
+    BFS and DFS close a state when it is generated, so no duplicate ever enters the
+    frontier. The best-first methods close a state when it is expanded; a state is
+    pushed again only with a cheaper path cost, and stale entries are skipped at pop.
+    """
+    if method == "IDA*":
+        return ida_search(problem)
+    if closed is None:
+        closed = {}
+    key_of, is_goal = problem.key, problem.is_goal
+    start = problem.initial
+    start_key = key_of(start)
+
+    if method in FRONTIERS:
+        if frontier is None:
+            frontier = FRONTIERS[method]()
+        successors, push, pop = problem.successors, frontier.push, frontier.pop
+        if successors is None:
+            # A problem given only through expand, which may need the heuristic of the state
+            expand, heuristic = problem.expand, problem.heuristic
+
+            def successors(state):
+                return [successor for successor, _, _ in expand(state, heuristic(state))]
+        closed[start_key] = (start, None)
+        push(0, (start, start_key))
+        while True:
+            try:
+                state, key = pop()
+            except IndexError:  # Every frontier raises IndexError when popped empty
+                return None
+            if is_goal(state):
+                return reconstruct_path(closed, key)
+            for successor in successors(state):
+                successor_key = key_of(successor)
+                if successor_key not in closed:
+                    closed[successor_key] = (successor, key)
+                    push(0, (successor, successor_key))
+
+    if method not in BEST_FIRST:
+        raise ValueError(f"Unknown search method: {method}")
+    g_weight, h_weight = BEST_FIRST[method]
+    if h_weight is None:
+        h_weight = weight
+    if frontier is None:
+        frontier = HeapFrontier()
+    expand, heuristic, push, pop = problem.expand, problem.heuristic, frontier.push, frontier.pop
+
+    start_h = problem.heuristic(start)
+    push(h_weight * start_h, (0, start_h, start, start_key, None))
+    best_cost = {start_key: 0}  # Cheapest known path cost of each key
+    inf = float("inf")
+    while True:
+        try:
+            cost, h_cost, state, key, parent = pop()
+        except IndexError:
+            return None
+        # Skip keys already expanded or reached more cheaply since this entry was pushed
+        if key in closed or cost > best_cost[key]:
+            continue
+        closed[key] = (state, parent)
+        if is_goal(state):
+            return reconstruct_path(closed, key)
+        for successor, step, successor_h in expand(state, h_cost):
+            successor_key = key_of(successor)
+            successor_cost = cost + step
+            if successor_cost >= best_cost.get(successor_key, inf) or successor_key in closed:
+                continue
+            best_cost[successor_key] = successor_cost
+            if successor_h is None:
+                successor_h = heuristic(successor)
+            push(g_weight * successor_cost + h_weight * successor_h,
+                 (successor_cost, successor_h, successor, successor_key, key), successor_cost)
+
+
+def ida_search(problem, max_expansions=None):
+    """
+    Iterative Deepening A*: repeated depth-first searches bounded by f = g + h, each
+    bound the smallest f that exceeded the previous one. Only the current path is
+    stored (states on it are not revisited). Returns the path, or None if there is no
+    solution or more than max_expansions states were expanded.
+    """
+    key_of, is_goal, expand, heuristic = problem.key, problem.is_goal, problem.expand, problem.heuristic
+    path = [problem.initial]
+    on_path = {key_of(problem.initial)}
+    expansions = 0
+
+    def search(state, cost, h_cost, bound):
+        nonlocal expansions
+        f_cost = cost + h_cost
+        if f_cost > bound:
+            return f_cost
+        if is_goal(state):
+            return None
+        expansions += 1
+        if max_expansions is not None and expansions > max_expansions:
+            raise StopIteration
+        minimum = float("inf")
+        for successor, step, successor_h in expand(state, h_cost):
+            successor_key = key_of(successor)
+            if successor_key in on_path:
+                continue
+            if successor_h is None:
+                successor_h = heuristic(successor)
+            path.append(successor)
+            on_path.add(successor_key)
+            t = search(successor, cost + step, successor_h, bound)
+            if t is None:
+                return None
+            path.pop()
+            on_path.discard(successor_key)
+            if t < minimum:
+                minimum = t
+        return minimum
+
+    start_h = problem.heuristic(problem.initial)
+    bound = start_h
+    try:
+        while True:
+            t = search(problem.initial, 0, start_h, bound)
+            if t is None:
+                return path
+            if t == float("inf"):
+                return None
+            bound = t
+    except StopIteration:
+        return None
+
+
+# Driver Code
+if __name__ == "__main__":
+    # Shortest route on a small grid with walls ('#'), from S to G
+    grid = [
+        "S..#....",
+        ".#.#.##.",
+        ".#...#..",
+        ".####.#.",
+        "......#G",
+    ]
+    rows, cols = len(grid), len(grid[0])
+    start = next((r, c) for r in range(rows) for c in range(cols) if grid[r][c] == "S")
+    goal = next((r, c) for r in range(rows) for c in range(cols) if grid[r][c] == "G")
+
+    def successors(cell):
+        r, c = cell
+        return [(r + dr, c + dc) for dr, dc in [(-1, 0), (1, 0), (0, -1), (0, 1)]
+                if 0 <= r + dr < rows and 0 <= c + dc < cols and grid[r + dr][c + dc] != "#"]
+
+    problem = Problem(start, successors, lambda cell: cell == goal,
+                      heuristic=lambda cell: abs(cell[0] - goal[0]) + abs(cell[1] - goal[1]))
+    for method in ("BFS", "DFS", "UCS", "A*", "Greedy", "IDA*"):
+        path = graph_search(problem, method)
+        print(f"{method:6} {len(path) - 1:2} moves: {path}")
+
+    # The same A* with a bucket frontier and an array-indexed closed list
+    closed = ArrayClosed(rows * cols, lambda key: divmod(key, cols))
+    indexed = Problem(start, successors, lambda cell: cell == goal, key=lambda cell: cell[0] * cols + cell[1],
+                      heuristic=problem.heuristic)
+    path = graph_search(indexed, "A*", frontier=BucketFrontier(), closed=closed)
+    print(f"A* (bucket frontier, array closed list) {len(path) - 1} moves, {len(closed)} states expanded")
@@ -0,0 +1,258 @@
+import random
+import sys
+import time
+from collections import Counter
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is only needed by batch_two_room_episodes
+    np = None
+
+import observers
+from observers import NullObserver
+
+CLEAN, DIRTY = 0, 1
+
+# Row and column offsets of the movement actions
+MOVES = {
+    "Up": (-1, 0),
+    "Down": (1, 0),
+    "Left": (0, -1),
+    "Right": (0, 1),
+}
+
+
+class RingBufferRecorder(observers.RingBufferRecorder):
+    """
+    Observer of the vacuum agent loops that keeps the last `capacity` steps of a run
+    (steps, positions, actions, dirty: whether the cell was dirty when the agent
+    acted), overwriting the oldest.
+    """
+
+    def __init__(self, capacity=10000):
+        super().__init__([("steps", "q"), ("positions", None), ("actions", None), ("dirty", "?")], capacity)
+
+    def action_counts(self):
+        """
+        How often each action was taken in the kept steps.
+        """
+        return Counter(self.actions[:len(self)])
+
+
+class SampledLogger(observers.SampledLogger):
+    """
+    Observer of the vacuum agent loops that prints one step out of every `every`.
+    """
+
+    def message(self, step, position, action, dirty):
+        return f"Step: {step}, Position: {position}, Status: {'dirty' if dirty else 'clean'}, Action: {action}"
+
+
+class GridEnvironment:
+    def __init__(self, rows, cols, dirt_probability=0.5, regeneration=0.0, start=None, seed=None):
+        """
+        Initialize an N x M grid of cells for a vacuum agent.
+        - rows, cols: Grid size; the cells live in one bytearray (one byte per cell, row-major).
+        - dirt_probability: Chance that each cell starts dirty.
+        - regeneration: Chance per clean cell per step of becoming dirty again.
+        - start: (row, col) of the agent (default: a random cell).
+        - seed: Makes the grid, the start cell and the regeneration reproducible.
+        """
+        self.rows = rows
+        self.cols = cols
+        self.size = rows * cols
+        self.regeneration = regeneration
+        self.rng = random.Random(seed)
+
+        # Random bytes mapped to 0/1 by a 256-entry table: the whole grid is drawn in C
+        threshold = round(dirt_probability * 256)
+        table = bytes(DIRTY if value < threshold else CLEAN for value in range(256))
+        self.cells = bytearray(self.rng.randbytes(self.size).translate(table))
+        self.dirty_count = self.cells.count(DIRTY)
+
+        if start is None:
+            self.position = self.rng.randrange(self.size)
+        else:
+            self.position = start[0] * cols + start[1]
+        self.steps = 0
+        self.cells_cleaned = 0
+
+    def location(self):
+        """
+        Return the agent's (row, col).
+        """
+        return divmod(self.position, self.cols)
+
+    def percept(self):
+        """
+        What the agent senses: its (row, col) and whether that cell is dirty.
+        """
+        return self.location(), self.cells[self.position] == DIRTY
+
+    def is_clean(self):
+        return self.dirty_count == 0
+
+    def execute(self, action):
+        """
+        Apply one action: "Suck", "NoOp" or a move in MOVES (bumping into the wall leaves the agent in place).
+        """
+        if action == "Suck":
+            if self.cells[self.position] == DIRTY:
+                self.cells[self.position] = CLEAN
+                self.dirty_count -= 1
+                self.cells_cleaned += 1
+        elif action != "NoOp":
+            row, col = divmod(self.position, self.cols)
+            d_row, d_col = MOVES[action]
+            row += d_row
+            col += d_col
+            if 0 <= row < self.rows and 0 <= col < self.cols:
+                self.position = row * self.cols + col
+
+    def regenerate(self):
+        """
+        Let dirt reappear. Instead of a coin flip per cell, draw how many cells are hit
+        this step (size * regeneration on average) and pick them at random, so a step
+        costs O(new dirt) rather than O(cells).
+        """
+        expected = self.size * self.regeneration
+        hits = int(expected)
+        if self.rng.random() < expected - hits:
+            hits += 1
+        for _ in range(hits):
+            cell = self.rng.randrange(self.size)
+            if self.cells[cell] == CLEAN:
+                self.cells[cell] = DIRTY
+                self.dirty_count += 1
+
+    def step(self, agent, record=None):
+        """
+        Advance the environment by one step: the agent acts on its percept, then dirt regenerates.
+        `record` is an observer's record method, called before the action is applied.
+        Returns the action taken.
+        """
+        percept = self.percept()
+        action = agent.act(percept)
+        if record is not None:
+            record(self.steps, percept[0], action, percept[1])
+        self.execute(action)
+        if self.regeneration:
+            self.regenerate()
+        self.steps += 1
+        return action
+
+    def run(self, agent, max_steps=None, stall_steps=None, observer=None):
+        """
+        Run the agent until the grid is clean, or for max_steps steps (a fixed horizon,
+        needed when dirt regenerates). Returns the run statistics.
+        - stall_steps: Without max_steps, the run also stops once the agent has gone this
+          many steps in a row without cleaning a cell, and reports "stalled" (default:
+          twice the number of cells, more than a sweep back and forth over the grid takes).
+        - observer: Gets record(step, (row, col), action, dirty) for every step (default:
+          none; see RingBufferRecorder and SampledLogger).
+        """
+        if max_steps is None and self.regeneration:
+            raise ValueError("A grid with regenerating dirt needs max_steps")
+        if stall_steps is None:
+            stall_steps = 2 * self.size
+        started = time.perf_counter()
+        steps = self.steps
+        cleaned = self.cells_cleaned
+        stalled = False
+        record = None if observer is None else observer.record  # step() skips a missing record
+        last_cleaned, last_progress = cleaned, self.steps
+        while not (max_steps is None and self.dirty_count == 0):
+            if max_steps is not None and self.steps - steps >= max_steps:
+                break
+            self.step(agent, record)
+            if self.cells_cleaned != last_cleaned:
+                last_cleaned, last_progress = self.cells_cleaned, self.steps
+            elif max_steps is None and self.steps - last_progress >= stall_steps:
+                stalled = True
+                break
+        elapsed = time.perf_counter() - started
+
+        cleaned = self.cells_cleaned - cleaned
+        return {
+            "steps": self.steps - steps,
+            "cells_cleaned": cleaned,
+            "dirty_remaining": self.dirty_count,
+            "stalled": stalled,
+            "seconds": elapsed,
+            "cells_cleaned_per_second": cleaned / elapsed if elapsed > 0 else 0.0,
+            "memory_bytes": sys.getsizeof(self.cells),
+        }
+
+
+def batch_two_room_episodes(policy, episodes, dirt_probability=0.5, max_steps=100, seed=None):
+    """
+    Run many independent episodes of the two-room world of Q1/Q2 in lockstep on NumPy
+    arrays and return the step count of each episode (an int array of length `episodes`).
+    - policy: "reflex" (Q1.ReflexVacuumCleaner: clean if dirty, else move) or "model"
+      (Q2.ModelBasedVacuumCleaner: remember each room's status, only move when the
+      other room is not known to be clean).
+    - dirt_probability: Chance that each room starts dirty (Q1/Q2 use 0.5).
+    - max_steps: Episodes still running after this many steps stop with this count.
+    - seed: Seed of the NumPy generator that draws the rooms and start positions.
+    """
+    if np is None:
+        raise ImportError("batch_two_room_episodes requires NumPy")
+    if policy not in ("reflex", "model"):
+        raise ValueError(f"Unknown policy: {policy}")
+    rng = np.random.default_rng(seed)
+    rows = np.arange(episodes)
+
+    dirty = rng.random((episodes, 2)) < dirt_probability  # Room A is column 0, room B column 1
+    position = rng.integers(0, 2, size=episodes)
+    known = np.zeros((episodes, 2), dtype=bool)  # Model: has the room been sensed?
+    known_dirty = np.zeros((episodes, 2), dtype=bool)  # Model: its last sensed status
+    steps = np.zeros(episodes, dtype=np.int64)
+
+    for _ in range(max_steps):
+        active = dirty.any(axis=1)
+        if not active.any():
+            break
+        here = dirty[rows, position]
+        other = 1 - position
+        if policy == "reflex":
+            suck = active & here
+            move = active & ~here
+        else:
+            # Sense and update the model, then clean or move to a room not known to be clean
+            known[rows, position] = True
+            known_dirty[rows, position] = here
+            suck = active & here
+            other_may_be_dirty = ~known[rows, other] | known_dirty[rows, other]
+            move = active & ~here & other_may_be_dirty
+            known_dirty[rows[suck], position[suck]] = False
+        dirty[rows[suck], position[suck]] = False
+        position = np.where(move, other, position)
+        steps += active
+
+    return steps
+
+
+# Driver Code
+if __name__ == "__main__":
+    class RandomAgent:
+        """
+        Sucks when the cell is dirty, otherwise moves at random.
+        """
+
+        def __init__(self, seed=None):
+            self.rng = random.Random(seed)
+
+        def act(self, percept):
+            _, dirty = percept
+            return "Suck" if dirty else self.rng.choice(list(MOVES))
+
+    environment = GridEnvironment(1000, 1000, dirt_probability=0.3, regeneration=1e-6, seed=0)
+    stats = environment.run(RandomAgent(seed=0), max_steps=100000)
+    print(f"1000 x 1000 grid, random agent: {stats}")
+
+    # Step-count distributions of the two-room agents over many episodes
+    if np is not None:
+        for policy in ("reflex", "model"):
+            steps = batch_two_room_episodes(policy, 100000, seed=0)
+            print(f"{policy:6} agent, 100000 episodes: mean {steps.mean():.3f} steps, "
+                  f"distribution {np.bincount(steps).tolist()}")